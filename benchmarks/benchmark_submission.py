@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of the Deadline submission hot path.
+
+Measures the code which runs for every submitted job and scales with the
+number of frames, AOVs and tiles. Run with Python of an environment where
+`ayon_core` and `pyblish` can be imported, e.g. AYON launcher:
+
+    ayon run benchmarks/benchmark_submission.py --frames 100 10000 100000
+
+Results are printed as minimal time per call, which is the most stable
+number to compare between addon versions. Benchmarks of modules which
+can't be imported (e.g. Maya submitter outside of Maya) are skipped.
+Submissions are posted to in-process stub of Deadline Webservice.
+
+"""
+import os
+import sys
+import timeit
+import argparse
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(CURRENT_DIR), "client"))
+sys.path.insert(0, CURRENT_DIR)
+
+import clique  # noqa: E402
+import pyblish.api  # noqa: E402
+
+from ayon_deadline.abstract_submit_deadline import (  # noqa: E402
+    AbstractSubmitDeadline,
+)
+from ayon_deadline.lib import (  # noqa: E402
+    AYONDeadlineJobInfo,
+    DeadlineIndexedVar,
+    DeadlineKeyValueVar,
+    FrameRanges,
+)
+from stub_webservice import StubWebservice  # noqa: E402
+
+JOB_INFO_VALUES = {
+    "chunk_size": 10,
+    "priority": 50,
+    "machine_limit": 0,
+    "concurrent_tasks": 1,
+    "frames": "1001-1100",
+    "group": "none",
+    "primary_pool": "render",
+    "secondary_pool": "none",
+    "use_published": True,
+    "use_asset_dependencies": True,
+    "use_workfile_dependency": True,
+}
+
+
+class BenchmarkSubmitDeadline(AbstractSubmitDeadline):
+    """Submitter filling job with generic values only."""
+
+    def get_job_info(self, job_info=None, **kwargs):
+        job_info.Plugin = "Benchmark"
+        return job_info
+
+    def get_plugin_info(self, **kwargs):
+        return {"SceneFile": "/project/work/scene_v001.ma"}
+
+
+def get_expected_files(frames, aovs, padding=4):
+    """Expected files in format of multi-AOV render instance."""
+    expected_files = {}
+    for aov_index in range(aovs):
+        aov = "aov{}".format(aov_index)
+        expected_files[aov] = [
+            "/project/render/{0}/shot_{0}.{1:0{2}d}.exr".format(
+                aov, frame, padding)
+            for frame in range(1001, 1001 + frames)
+        ]
+    return [expected_files]
+
+
+class StubAnatomy:
+    """Anatomy without project roots, paths are used as they are."""
+
+    def find_root_template_from_path(self, path):
+        return False, path
+
+
+def create_instance(frames, aovs):
+    context = pyblish.api.Context()
+    context.data.update({
+        "currentFile": "/project/work/scene_v001.ma",
+        "comment": "benchmark",
+        "anatomy": StubAnatomy(),
+        "projectName": "benchmark",
+        "folderPath": "/shots/sh010",
+        "task": "lighting",
+        "user": "benchmark",
+    })
+    instance = context.create_instance("renderMain")
+    instance.data.update({
+        "productName": "renderMain",
+        "productType": "render",
+        "version": 1,
+        "anatomyData": {},
+        "folderEntity": None,
+        "outputDir": "/project/render",
+    })
+    instance.data["expectedFiles"] = get_expected_files(frames, aovs)
+    instance.data["deadline"] = {
+        "job_info": AYONDeadlineJobInfo.from_dict(JOB_INFO_VALUES),
+    }
+    return instance
+
+
+def create_submitter(url, frames, aovs, async_submission=False):
+    """Submitter with job info of instance, ready to submit to `url`."""
+    instance = create_instance(frames, aovs)
+    instance.context.data["project_settings"] = {
+        "deadline": {"async_submission": async_submission}
+    }
+    instance.data["deadline"].update({
+        "url": url,
+        "auth": None,
+        "verify": False,
+    })
+    plugin = BenchmarkSubmitDeadline()
+    plugin._instance = instance
+    plugin._deadline_url = url
+    plugin.job_info = plugin.get_generic_job_info(instance)
+    plugin.plugin_info = plugin.get_plugin_info()
+    plugin.aux_files = []
+    return plugin
+
+
+def create_job_info(outputs):
+    job_info = AYONDeadlineJobInfo.from_dict(JOB_INFO_VALUES)
+    for index in range(outputs):
+        job_info.OutputDirectory += "/project/render"
+        job_info.OutputFilename += "shot.{:04d}.exr".format(index)
+    return job_info
+
+
+def benchmark(label, func, number=None, repeat=5, setup=None):
+    """Print minimal time per call of `func`.
+
+    Callable `setup` runs before each repeat and is not measured.
+    """
+    timer = timeit.Timer(func, setup=setup or "pass")
+    if number is None:
+        number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    print("{:<60} {:>12.3f} ms".format(label, best * 1000))
+    return best
+
+
+def benchmark_job_info(frames_counts):
+    benchmark(
+        "AYONDeadlineJobInfo.from_dict",
+        lambda: AYONDeadlineJobInfo.from_dict(JOB_INFO_VALUES)
+    )
+    for frames in frames_counts:
+        job_info = create_job_info(frames)
+        benchmark(
+            "AYONDeadlineJobInfo.serialize [outputs={}]".format(frames),
+            job_info.serialize
+        )
+        benchmark(
+            "AYONDeadlineJobInfo.copy [outputs={}]".format(frames),
+            job_info.copy
+        )
+
+
+def benchmark_variables(frames_counts):
+    for frames in frames_counts:
+        def append():
+            var = DeadlineIndexedVar("OutputFilename")
+            for _ in range(frames):
+                var += "shot.####.exr"
+
+        benchmark(
+            "DeadlineIndexedVar += [entries={}]".format(frames), append)
+
+        def refill():
+            var = DeadlineIndexedVar("OutputFilename")
+            for _ in range(frames):
+                var += "shot.####.exr"
+            # Freed indexes are reused by following appends
+            for index in range(0, frames, 10):
+                del var[index]
+            for _ in range(0, frames, 10):
+                var += "shot.####.exr"
+
+        benchmark(
+            "DeadlineIndexedVar del and += [entries={}]".format(frames),
+            refill
+        )
+
+        indexed_var = DeadlineIndexedVar("OutputFilename")
+        key_value_var = DeadlineKeyValueVar("EnvironmentKeyValue")
+        for index in range(frames):
+            indexed_var[index] = "shot.{:04d}.exr".format(index)
+            key_value_var["KEY_{}".format(index)] = index
+        benchmark(
+            "DeadlineIndexedVar.serialize [entries={}]".format(frames),
+            indexed_var.serialize
+        )
+        benchmark(
+            "DeadlineKeyValueVar.serialize [entries={}]".format(frames),
+            key_value_var.serialize
+        )
+
+
+def check_indexed_var_free_index():
+    """Appending to DeadlineIndexedVar reuses the lowest freed index.
+
+    Benchmarks measure appending which relies on tracking of the lowest
+    free index, the tracking must stay correct when entries are removed.
+    """
+    var = DeadlineIndexedVar("OutputFilename")
+    for index in range(5):
+        var += index
+    assert var.next_available_index() == 5
+
+    del var[3]
+    del var[1]
+    var += "del"
+    assert var[1] == "del"
+    var += "del"
+    assert var[3] == "del"
+
+    var.pop(2)
+    var.pop(10, None)
+    var += "pop"
+    assert var[2] == "pop"
+
+    key, _ = var.popitem()
+    var += "popitem"
+    assert var[key] == "popitem"
+
+    var.clear()
+    var += "clear"
+    assert var == {0: "clear"}
+    assert var.next_available_index() == 1
+
+
+def benchmark_submitter(frames_counts, aovs_counts):
+    plugin = BenchmarkSubmitDeadline()
+    for frames in frames_counts:
+        for aovs in aovs_counts:
+            label = "[frames={} aovs={}]".format(frames, aovs)
+
+            def setup():
+                # Job info is filled by the call, each call gets new one
+                plugin._instance = create_instance(frames, aovs)
+
+            def get_generic_job_info():
+                return plugin.get_generic_job_info(plugin._instance)
+
+            benchmark(
+                "get_generic_job_info {}".format(label),
+                get_generic_job_info,
+                number=1,
+                repeat=10,
+                setup=setup
+            )
+
+            setup()
+            plugin.job_info = get_generic_job_info()
+            plugin.plugin_info = plugin.get_plugin_info()
+            plugin.aux_files = []
+            benchmark(
+                "assemble_payload {}".format(label),
+                plugin.assemble_payload
+            )
+
+
+def benchmark_process_submission(frames_counts, aovs_counts):
+    """Assembling and posting of payload to stub webservice."""
+    with StubWebservice() as webservice:
+        for frames in frames_counts:
+            for aovs in aovs_counts:
+                plugin = create_submitter(webservice.url, frames, aovs)
+                benchmark(
+                    "process_submission [frames={} aovs={}]".format(
+                        frames, aovs),
+                    plugin.process_submission
+                )
+                webservice.reset()
+
+
+def benchmark_tiles(tiles_counts):
+    try:
+        submit_maya_deadline = load_plugin("maya", "submit_maya_deadline")
+    except ImportError as exc:
+        print("Skipping tile benchmarks: {}".format(exc))
+        return
+    _format_tiles = submit_maya_deadline._format_tiles
+
+    for tiles in tiles_counts:
+        benchmark(
+            "_format_tiles [tiles={0}x{0}]".format(tiles),
+            lambda: _format_tiles(
+                "/project/render/beauty/shot_beauty.1001.exr",
+                0, tiles, tiles, 3840, 2160,
+                "<RenderLayer>/<RenderLayer>_<RenderPass>"
+            )
+        )
+
+
+def benchmark_validate_expected_files(frames_counts):
+    validate_expected_and_rendered_files = load_plugin(
+        "global", "validate_expected_and_rendered_files")
+
+    plugin = validate_expected_and_rendered_files.ValidateExpectedFiles()
+    for frames in frames_counts:
+        filenames = [
+            "shot_beauty.{:04d}.exr".format(frame)
+            for frame in range(1001, 1001 + frames)
+        ]
+        frame_list = ["1001-{}".format(1000 + frames)]
+        # Every 10th frame is missing
+        existing_files = set(filenames[::10]).symmetric_difference(filenames)
+
+        def get_missing_files():
+            collections, _ = clique.assemble(filenames)
+            missing_frames = (
+                FrameRanges.parse(frame_list)
+                - plugin._get_existing_frames(collections[0], existing_files)
+            )
+            return plugin._get_frames_filenames(
+                collections[0], missing_frames)
+
+        benchmark(
+            "ValidateExpectedFiles missing files [frames={}]".format(frames),
+            get_missing_files
+        )
+
+
+def load_plugin(host_name, name):
+    """Publish plugins are not importable as modules, load them by path."""
+    import importlib.util
+
+    from ayon_deadline.addon import DEADLINE_ADDON_ROOT
+
+    path = os.path.join(
+        DEADLINE_ADDON_ROOT, "plugins", "publish", host_name,
+        "{}.py".format(name)
+    )
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--frames", type=int, nargs="+",
+        default=[100, 1000, 10000, 100000])
+    parser.add_argument("--aovs", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--tiles", type=int, nargs="+", default=[2, 8])
+    args = parser.parse_args()
+
+    os.environ.setdefault("AYON_BUNDLE_NAME", "benchmark")
+
+    check_indexed_var_free_index()
+
+    benchmark_job_info(args.frames)
+    benchmark_variables(args.frames)
+    benchmark_submitter(args.frames, args.aovs)
+    benchmark_process_submission(args.frames, args.aovs)
+    benchmark_tiles(args.tiles)
+    benchmark_validate_expected_files(args.frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of Unreal Deadline RPC transports.
+
+Compares calls per second of XML-RPC and JSON transport of the RPC server
+used between Deadline `UnrealEngine5` plug-in and Unreal, for the calls
+Unreal jobs send most often. Runs with plain Python, no Deadline or Unreal
+is needed:
+
+    python benchmarks/benchmark_unreal_rpc.py --calls 2000 --files 10 5000
+
+"""
+import os
+import sys
+import time
+import argparse
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(
+    os.path.dirname(CURRENT_DIR),
+    "client",
+    "ayon_deadline",
+    "repository",
+    "custom",
+    "plugins",
+    "UnrealEngine5",
+))
+
+from ue_utils.rpc.base_server import (  # noqa: E402
+    BaseRPCServerManager,
+    XMLRPC_TRANSPORT,
+    JSON_TRANSPORT,
+)
+from ue_utils.rpc.client import RPCClient  # noqa: E402
+from ue_utils.rpc.factory import remote_call  # noqa: E402
+from ue_utils.rpc.server import RPCServerThread  # noqa: E402
+
+
+class BenchmarkJobManager:
+    """Mimics calls of `BaseDeadlineRPCJobManager` without Deadline."""
+
+    def __init__(self):
+        self.progress = 0
+        self.filenames = []
+
+    def set_progress(self, progress):
+        self.progress = progress
+        return True
+
+    def log_info(self, message):
+        return True
+
+    def update_job_output_filenames(self, filenames):
+        self.filenames = list(filenames)
+        return True
+
+
+class BenchmarkServerManager(BaseRPCServerManager):
+    def __init__(self, transport):
+        super().__init__()
+        self.name = "BenchmarkRPCServer"
+        self.port = 0
+        self.transport = transport
+        self.threaded_server_class = RPCServerThread
+
+    def start_server_thread(self):
+        super().start_server_thread()
+        self.server_thread.server.register_instance(BenchmarkJobManager())
+
+    @property
+    def server_port(self):
+        return self.get_server().socket.getsockname()[1]
+
+
+def add_numbers(first, second):
+    """Function called with `remote_call` decorator, runs on server."""
+    return first + second
+
+
+def benchmark(label, func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - started
+    print("{:<48} {:>10.1f} calls/s {:>8.3f} ms/call".format(
+        label, calls / elapsed, elapsed / calls * 1000))
+
+
+def run(transport, calls, files_counts):
+    manager = BenchmarkServerManager(transport)
+    manager.start(threaded=True)
+    try:
+        proxy = RPCClient(manager.server_port, transport=transport).proxy
+        benchmark(
+            "{} set_progress".format(transport),
+            lambda: proxy.set_progress(50.0),
+            calls
+        )
+        benchmark(
+            "{} log_info".format(transport),
+            lambda: proxy.log_info("LogMovieRenderPipeline: Rendered frame"),
+            calls
+        )
+        remote_add_numbers = remote_call(
+            manager.server_port, transport=transport)(add_numbers)
+        benchmark(
+            "{} remote_call decorator".format(transport),
+            lambda: remote_add_numbers(1, 2),
+            calls
+        )
+        for files_count in files_counts:
+            filenames = [
+                "/project/render/shot/beauty/shot_beauty.{:04d}.exr".format(
+                    frame)
+                for frame in range(files_count)
+            ]
+            benchmark(
+                "{} update_job_output_filenames {} files".format(
+                    transport, files_count),
+                lambda: proxy.update_job_output_filenames(filenames),
+                max(1, calls // max(1, files_count // 100))
+            )
+    finally:
+        manager.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument(
+        "--files", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument(
+        "--transport",
+        nargs="+",
+        choices=[XMLRPC_TRANSPORT, JSON_TRANSPORT],
+        default=[XMLRPC_TRANSPORT, JSON_TRANSPORT],
+    )
+    args = parser.parse_args()
+
+    for transport in args.transport:
+        run(transport, args.calls, args.files)
+
+
+if __name__ == "__main__":
+    main()
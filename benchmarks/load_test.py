@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Load test of Deadline submissions against stub webservice.
+
+Drives `AbstractSubmitDeadline.submit` and submission of publish jobs by
+`ProcessSubmittedJobOnFarm` from concurrent workers and reports
+submissions per second and latency percentiles. Publish folder of the
+publish job is not queried from AYON server.
+
+    ayon run benchmarks/load_test.py --jobs 500 --concurrency 1 8 32 \\
+        --latency 0.02 0.2 --error-rate 0.01
+
+Use `--url` to run against real Deadline Webservice instead of the stub.
+
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, CURRENT_DIR)
+
+from benchmark_submission import (  # noqa: E402
+    create_submitter,
+    load_plugin,
+)
+from stub_webservice import StubWebservice  # noqa: E402
+
+from ayon_deadline.submission_queue import (  # noqa: E402
+    resolve_submission_job,
+)
+
+PUBLISH_DIR = "/project/publish/renderMain/v001"
+
+
+def get_publish_plugin_class():
+    """`ProcessSubmittedJobOnFarm` with publish folder not queried."""
+    submit_publish_job = load_plugin("global", "submit_publish_job")
+
+    class LoadTestSubmitPublishJob(
+        submit_publish_job.ProcessSubmittedJobOnFarm
+    ):
+        def _get_publish_folder(self, *args, **kwargs):
+            return PUBLISH_DIR
+
+    return LoadTestSubmitPublishJob
+
+
+def submit_render_and_publish(url, frames, aovs, publish_plugin_class):
+    plugin = create_submitter(url, frames, aovs)
+    plugin.process_submission()
+    instance = plugin._instance
+    render_job = resolve_submission_job(
+        instance.data["deadlineSubmissionJob"])
+
+    publish_plugin = publish_plugin_class()
+    publish_plugin.deadline_url = url
+    publish_plugin._submit_deadline_post_job(
+        instance, render_job, [instance.data])
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100 * len(values))))
+    return values[index]
+
+
+def run(url, jobs, concurrency, frames, aovs):
+    """Submit `jobs` render jobs with publish jobs from workers.
+
+    Returns:
+        Tuple[List[float], List[str], float]: Latencies of successful
+            submissions, errors and elapsed time.
+
+    """
+    latencies = []
+    errors = []
+    publish_plugin_class = get_publish_plugin_class()
+
+    def _submit(_):
+        started = time.perf_counter()
+        try:
+            submit_render_and_publish(
+                url, frames, aovs, publish_plugin_class)
+        except Exception as exc:
+            errors.append(str(exc))
+            return
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(_submit, range(jobs)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def report(label, latencies, errors, elapsed):
+    print(
+        "{:<28} {:>6} ok {:>5} err {:>9.1f} sub/s"
+        " p50 {:>7.1f} ms p95 {:>7.1f} ms p99 {:>7.1f} ms max {:>7.1f} ms"
+        .format(
+            label,
+            len(latencies),
+            len(errors),
+            len(latencies) / elapsed if elapsed else 0.0,
+            percentile(latencies, 50) * 1000,
+            percentile(latencies, 95) * 1000,
+            percentile(latencies, 99) * 1000,
+            max(latencies, default=0.0) * 1000,
+        )
+    )
+
+
+def main():
+    os.environ.setdefault("AYON_BUNDLE_NAME", "benchmark")
+    os.environ.setdefault("AYON_DEFAULT_SETTINGS_VARIANT", "production")
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--aovs", type=int, default=4)
+    parser.add_argument(
+        "--latency", type=float, nargs="+", default=[0.02],
+        help="Stub latency in seconds, or min and max of random latency."
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--url", help="Real Deadline Webservice url instead of stub.")
+    args = parser.parse_args()
+
+    latency = args.latency[0] if len(args.latency) == 1 else args.latency
+    webservice = None
+    url = args.url
+    if not url:
+        webservice = StubWebservice(
+            latency=latency, error_rate=args.error_rate).start()
+        url = webservice.url
+
+    try:
+        for concurrency in args.concurrency:
+            if webservice is not None:
+                webservice.reset()
+            latencies, errors, elapsed = run(
+                url, args.jobs, concurrency, args.frames, args.aovs)
+            report(
+                "concurrency={}".format(concurrency),
+                latencies, errors, elapsed
+            )
+            if webservice is not None:
+                server_durations = [
+                    request.duration for request in webservice.requests
+                ]
+                print("    webservice requests: {} p99 {:.1f} ms".format(
+                    len(server_durations),
+                    percentile(server_durations, 99) * 1000
+                ))
+    finally:
+        if webservice is not None:
+            webservice.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""In-process stub of Deadline Webservice.
+
+Implements the end-points used by the addon so the submission traffic can
+be exercised without Deadline repository:
+
+    POST /api/jobs
+    GET  /api/jobs?JobID=<id>[,<id>...]
+    GET  /api/pools, /api/groups, /api/limitgroups, /api/slaves
+
+Latency and error rate are configurable, all requests are recorded.
+
+Example:
+    >>> with StubWebservice(latency=0.05, error_rate=0.01) as webservice:
+    ...     requests.post(webservice.url + "/api/jobs", json=payload)
+    >>> webservice.requests[0].duration
+
+"""
+import json
+import time
+import random
+import itertools
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    status: int
+    started: float
+    duration: float
+    body: dict = None
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections, same as real Webservice
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Don't spam stderr with every request
+        pass
+
+    def do_GET(self):
+        self.server.stub.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.stub.handle(self, "POST")
+
+
+class StubWebservice:
+    """Stub of Deadline Webservice running in background thread.
+
+    Args:
+        latency (Union[float, Tuple[float, float]]): Seconds each request
+            takes, or range of seconds to pick randomly from.
+        error_rate (float): Probability (0-1) of responding with 503.
+        pools (Optional[List[str]]): Pools returned by '/api/pools'.
+        groups (Optional[List[str]]): Groups returned by '/api/groups'.
+        limit_groups (Optional[List[str]]): Limit groups returned by
+            '/api/limitgroups'.
+        workers (Optional[List[str]]): Workers returned by '/api/slaves'.
+        seed (Optional[int]): Seed for latency and error randomization.
+
+    """
+    def __init__(
+        self,
+        latency=0.0,
+        error_rate=0.0,
+        pools=None,
+        groups=None,
+        limit_groups=None,
+        workers=None,
+        seed=None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.pools = pools or ["none", "render", "sim"]
+        self.groups = groups or ["none", "cpu", "gpu"]
+        self.limit_groups = limit_groups or ["nuke", "houdini"]
+        self.workers = workers or [
+            "render{:03d}".format(index) for index in range(100)
+        ]
+        self.requests = []
+        self.jobs = {}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._job_counter = itertools.count(1)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), _StubRequestHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def reset(self):
+        with self._lock:
+            self.requests = []
+            self.jobs = {}
+
+    def create_job_id(self):
+        """Job id in format of Deadline (24 hexadecimal characters)."""
+        return "{:024x}".format(next(self._job_counter))
+
+    def handle(self, handler, method):
+        started = time.time()
+        parsed = urlparse(handler.path)
+        body = None
+        if method == "POST":
+            length = int(handler.headers.get("Content-Length") or 0)
+            body = json.loads(handler.rfile.read(length) or b"null")
+
+        with self._lock:
+            latency = self.latency
+            if isinstance(latency, (tuple, list)):
+                latency = self._random.uniform(*latency)
+            failed = self._random.random() < self.error_rate
+
+        if latency:
+            time.sleep(latency)
+
+        if failed:
+            status, response = 503, "Service Unavailable"
+        else:
+            status, response = self._route(
+                method, parsed.path, parse_qs(parsed.query), body)
+
+        data = json.dumps(response).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+        with self._lock:
+            self.requests.append(RecordedRequest(
+                method, handler.path, status, started,
+                time.time() - started, body
+            ))
+
+    def _route(self, method, path, query, body):
+        if path == "/api/jobs":
+            if method == "POST":
+                return self._submit_job(body)
+            # Multiple job ids are separated by comma
+            job_ids = query.get("JobID", [""])[0].split(",")
+            with self._lock:
+                jobs = [
+                    self.jobs[job_id]
+                    for job_id in job_ids
+                    if job_id in self.jobs
+                ]
+            return 200, jobs
+
+        items_by_path = {
+            "/api/pools": self.pools,
+            "/api/groups": self.groups,
+            "/api/limitgroups": self.limit_groups,
+            "/api/slaves": self.workers,
+        }
+        if method == "GET" and path in items_by_path:
+            return 200, list(items_by_path[path])
+        return 404, "Not Found"
+
+    def _submit_job(self, payload):
+        if not payload or "JobInfo" not in payload:
+            return 400, "Missing JobInfo"
+
+        job_info = payload["JobInfo"]
+        job_id = self.create_job_id()
+        job = {
+            "_id": job_id,
+            "Props": {
+                "Name": job_info.get("Name"),
+                "Batch": job_info.get("BatchName", ""),
+                "User": job_info.get("UserName", ""),
+                "Frames": job_info.get("Frames", ""),
+                "Plug": job_info.get("Plugin"),
+            },
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+        return 200, job
@@ -9,9 +9,13 @@ from abc import abstractmethod
 import getpass
 import os
 import datetime
-from copy import deepcopy
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 import pyblish.api
 from ayon_core.pipeline.publish import (
@@ -22,16 +26,133 @@ from ayon_core.pipeline.publish import (
 from ayon_core.pipeline.publish.lib import (
     replace_with_published_scene_path
 )
-from ayon_core.pipeline.farm.tools import iter_expected_files
 from ayon_core.lib import is_in_tests
-from ayon_deadline.lib import AYONDeadlineJobInfo
+from ayon_deadline.lib import (
+    AYONDeadlineJobInfo,
+    collapse_expected_files,
+    iter_expected_file_groups,
+)
+from ayon_deadline.submission_queue import (
+    SubmissionError,
+    get_submission_queue,
+    post_or_spool,
+)
 
 JSONDecodeError = getattr(json.decoder, "JSONDecodeError", ValueError)
 
 
-def requests_post(*args, **kwargs):
+# Default values used for connections to Deadline Webservice
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+_sessions_by_url = {}
+_sessions_lock = threading.Lock()
+# Values used for new sessions, see 'configure_deadline_sessions'
+_session_config = {
+    "pool_size": DEFAULT_POOL_SIZE,
+    "max_retries": DEFAULT_MAX_RETRIES,
+}
+
+
+def configure_deadline_sessions(pool_size=None, max_retries=None):
+    """Set connection pool size and retries of Deadline sessions.
+
+    Cached sessions are dropped when values change, so following requests
+    use sessions with new values. Requests in progress finish with the
+    session they started with.
+
+    Args:
+        pool_size (Optional[int]): Maximum connections kept in the pool.
+        max_retries (Optional[int]): Number of retries of failed requests.
+
+    """
+    config = {
+        "pool_size": (
+            DEFAULT_POOL_SIZE if pool_size is None else pool_size),
+        "max_retries": (
+            DEFAULT_MAX_RETRIES if max_retries is None else max_retries),
+    }
+    with _sessions_lock:
+        if config != _session_config:
+            _session_config.update(config)
+            _sessions_by_url.clear()
+
+
+def get_deadline_session(url, pool_size=None, max_retries=None):
+    """Return shared session with connection pool for Deadline Webservice.
+
+    Sessions are cached per scheme and host of the url so all calls to the
+    same webservice reuse already opened (keep-alive) connections instead
+    of doing new TCP/TLS handshake for each request. Calls asking for
+    different pool size or retries get separate session.
+
+    Requests are retried with exponential backoff on connection errors.
+    Failed responses (5xx) and dropped connections are retried only for
+    idempotent methods (e.g. GET) so the job is not submitted twice.
+
+    Args:
+        url (str): Any url of the Deadline Webservice.
+        pool_size (Optional[int]): Maximum connections kept in the pool.
+            Defaults to value set by `configure_deadline_sessions`.
+        max_retries (Optional[int]): Number of retries of failed requests.
+            Defaults to value set by `configure_deadline_sessions`.
+
+    Returns:
+        requests.Session: Session for the webservice.
+
+    """
+    parsed_url = urlparse(url)
+    with _sessions_lock:
+        if pool_size is None:
+            pool_size = _session_config["pool_size"]
+        if max_retries is None:
+            max_retries = _session_config["max_retries"]
+        key = (
+            "{}://{}".format(parsed_url.scheme, parsed_url.netloc),
+            pool_size,
+            max_retries,
+        )
+        session = _sessions_by_url.get(key)
+        if session is None:
+            retry = Retry(
+                total=max_retries,
+                backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_CODES,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions_by_url[key] = session
+    return session
+
+
+def _session_request(method, url, **kwargs):
+    auth = kwargs.get("auth")
+    if auth:
+        kwargs["auth"] = tuple(auth)  # explicit cast to tuple
+    # add timeout before bailing out if not explicitly set
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = DEFAULT_TIMEOUT
+    max_retries = kwargs.pop("max_retries", None)
+    return get_deadline_session(url, max_retries=max_retries).request(
+        method, url, **kwargs)
+
+
+def requests_post(url, **kwargs):
     """Wrap request post method.
 
+    Request is sent through shared session of the Deadline Webservice, see
+    `get_deadline_session`.
+
     Disabling SSL certificate validation if ``verify`` kwarg is set to False.
     This is useful when Deadline server is
     running with self-signed certificates and its certificate is not
@@ -42,17 +163,16 @@ def requests_post(*args, **kwargs):
         of defense SSL is providing, and it is not recommended.
 
     """
-    auth = kwargs.get("auth")
-    if auth:
-        kwargs["auth"] = tuple(auth)  # explicit cast to tuple
-    # add 10sec timeout before bailing out
-    kwargs['timeout'] = 10
-    return requests.post(*args, **kwargs)
+    return _session_request("POST", url, **kwargs)
 
 
-def requests_get(*args, **kwargs):
+def requests_get(url, **kwargs):
     """Wrap request get method.
 
+    Request is sent through shared session of the Deadline Webservice, see
+    `get_deadline_session`. Retries of the session can be changed with
+    ``max_retries`` kwarg.
+
     Disabling SSL certificate validation if ``verify`` kwarg is set to False.
     This is useful when Deadline server is
     running with self-signed certificates and its certificate is not
@@ -63,12 +183,17 @@ def requests_get(*args, **kwargs):
         of defense SSL is providing, and it is not recommended.
 
     """
-    auth = kwargs.get("auth")
-    if auth:
-        kwargs["auth"] = tuple(auth)
-    # add 10sec timeout before bailing out
-    kwargs['timeout'] = 10
-    return requests.get(*args, **kwargs)
+    return _session_request("GET", url, **kwargs)
+
+
+def requests_delete(url, **kwargs):
+    """Wrap request delete method.
+
+    Request is sent through shared session of the Deadline Webservice, see
+    `get_deadline_session`.
+
+    """
+    return _session_request("DELETE", url, **kwargs)
 
 
 class AbstractSubmitDeadline(
@@ -82,6 +207,8 @@ class AbstractSubmitDeadline(
     order = pyblish.api.IntegratorOrder + 0.1
 
     import_reference = False
+    # maximum of payloads posted at the same time by 'submit_many'
+    max_concurrent_submissions = 8
 
     def __init__(self, *args, **kwargs):
         super(AbstractSubmitDeadline, self).__init__(*args, **kwargs)
@@ -101,7 +228,7 @@ class AbstractSubmitDeadline(
         assert self._deadline_url, "Requires Deadline Webservice URL"
 
         job_info = self.get_generic_job_info(instance)
-        self.job_info = self.get_job_info(job_info=deepcopy(job_info))
+        self.job_info = self.get_job_info(job_info=job_info.copy())
 
         self._set_scene_path(
             context.data["currentFile"], job_info.UsePublished)
@@ -116,7 +243,7 @@ class AbstractSubmitDeadline(
         job_id = self.process_submission()
         self.log.info(f"Submitted job to Deadline: {job_id}.")
 
-        instance.data["deadline"]["job_info"] = deepcopy(self.job_info)
+        instance.data["deadline"]["job_info"] = self.job_info.copy()
 
         # TODO: Find a way that's more generic and not render type specific
         if instance.data.get("splitRender"):
@@ -133,7 +260,7 @@ class AbstractSubmitDeadline(
             verify = instance.data["deadline"]["verify"]
             render_job_id = self.submit(payload, auth, verify)
 
-            instance.data["deadline"]["job_info"] = deepcopy(render_job_info)
+            instance.data["deadline"]["job_info"] = render_job_info.copy()
             self.log.info("Render job id: %s", render_job_id)
 
     def _set_scene_path(self, current_file, use_published):
@@ -192,8 +319,28 @@ class AbstractSubmitDeadline(
         if job_info.SecondaryPool != "none":
             job_info.SecondaryPool = job_info.SecondaryPool
 
-        exp = instance.data.get("expectedFiles")
-        for filepath in iter_expected_files(exp):
+        # Register sequences with frame token so each output is one entry,
+        #   sequences created by collector are used as they are
+        sequences = list(instance.data.get("expectedFileSequences") or [])
+        sequence_files = {
+            filepath
+            for sequence in sequences
+            for filepath in sequence
+        }
+        single_files = []
+        for filepaths in iter_expected_file_groups(
+            instance.data.get("expectedFiles")
+        ):
+            group_sequences, group_files = collapse_expected_files(
+                filepath
+                for filepath in filepaths
+                if filepath not in sequence_files
+            )
+            sequences.extend(group_sequences)
+            single_files.extend(group_files)
+        filepaths = [sequence.hashed_path for sequence in sequences]
+        filepaths.extend(single_files)
+        for filepath in filepaths:
             job_info.OutputDirectory += os.path.dirname(filepath)
             job_info.OutputFilename += os.path.basename(filepath)
 
@@ -318,6 +465,11 @@ class AbstractSubmitDeadline(
             auth (tuple): (username, password)
             verify (bool): verify SSL certificate if present
 
+        When asynchronous submission is enabled in Settings, the payload is
+        only spooled and placeholder job id is returned. Placeholder can be
+        used as dependency of following submissions, see
+        `ayon_deadline.submission_queue`.
+
         Returns:
             str: resulting Deadline job id.
 
@@ -325,25 +477,169 @@ class AbstractSubmitDeadline(
             KnownPublishError: if submission fails.
 
         """
-        url = "{}/api/jobs".format(self._deadline_url)
-        response = requests_post(
-            url, json=payload, auth=auth, verify=verify)
-        if not response.ok:
-            self.log.error("Submission failed!")
-            self.log.error(response.status_code)
-            self.log.error(response.content)
-            self.log.debug(payload)
-            raise KnownPublishError(response.text)
-
-        try:
-            result = response.json()
-        except JSONDecodeError:
-            msg = "Broken response {}. ".format(response)
-            msg += "Try restarting the Deadline Webservice."
-            self.log.warning(msg, exc_info=True)
-            raise KnownPublishError("Broken response from DL")
+        if self._is_async_submission():
+            result = self._enqueue_job(payload, auth, verify)
+        else:
+            result = self._post_job(payload, auth, verify)
 
         # for submit publish job
         self._instance.data["deadlineSubmissionJob"] = result
 
+        return self._get_job_id(result)
+
+    def submit_many(self, payloads, auth, verify, dependencies=None):
+        """Submit multiple payloads to Deadline API end-point concurrently.
+
+        Payloads are posted by a bounded pool of worker threads (see
+        `max_concurrent_submissions`). Payloads depending on other payloads
+        from the same batch are submitted only after their dependencies
+        have job id, which is then added to their 'JobDependencies'.
+
+        Args:
+            payloads (list[dict]): Payloads to become json in deadline
+                submission.
+            auth (tuple): (username, password)
+            verify (bool): verify SSL certificate if present
+            dependencies (Optional[dict[int, list[int]]]): Indexes of
+                payloads from `payloads` each payload depends on.
+
+        Returns:
+            list[str]: resulting Deadline job ids in order of `payloads`.
+
+        Throws:
+            KnownPublishError: if any submission fails.
+
+        """
+        if not payloads:
+            return []
+
+        if self._is_async_submission():
+            submit_func = self._enqueue_job
+        else:
+            submit_func = self._post_job
+
+        dependencies = dependencies or {}
+        results = [None] * len(payloads)
+        remaining = list(range(len(payloads)))
+        max_workers = max(
+            1, min(self.max_concurrent_submissions, len(payloads)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while remaining:
+                ready = [
+                    index
+                    for index in remaining
+                    if all(
+                        results[dep_index] is not None
+                        for dep_index in dependencies.get(index, [])
+                    )
+                ]
+                if not ready:
+                    raise KnownPublishError(
+                        "Circular dependencies between submitted payloads."
+                    )
+
+                for index in ready:
+                    dependency_ids = [
+                        self._get_job_id(results[dep_index])
+                        for dep_index in dependencies.get(index, [])
+                    ]
+                    if dependency_ids:
+                        self._add_job_dependencies(
+                            payloads[index], dependency_ids)
+
+                futures = [
+                    executor.submit(
+                        submit_func, payloads[index], auth, verify)
+                    for index in ready
+                ]
+                for index, future in zip(ready, futures):
+                    results[index] = future.result()
+
+                ready_indexes = set(ready)
+                remaining = [
+                    index
+                    for index in remaining
+                    if index not in ready_indexes
+                ]
+
+        # for submit publish job, same as sequential 'submit' calls would do
+        self._instance.data["deadlineSubmissionJob"] = results[-1]
+
+        return [self._get_job_id(result) for result in results]
+
+    def _is_async_submission(self):
+        """Submissions should be posted to Deadline in background."""
+        project_settings = self._instance.context.data["project_settings"]
+        return project_settings["deadline"].get("async_submission", False)
+
+    def _is_spool_on_failure(self):
+        """Submissions should be spooled when Webservice is unavailable."""
+        project_settings = self._instance.context.data["project_settings"]
+        return project_settings["deadline"].get(
+            "spool_failed_submissions", False)
+
+    def _enqueue_job(self, payload, auth, verify):
+        """Spool payload to be posted to Deadline in background.
+
+        Returns:
+            Future: Future resolved with Deadline response of submitted job.
+
+        """
+        future = get_submission_queue().enqueue(
+            self._deadline_url,
+            payload,
+            auth,
+            verify,
+            spool_on_failure=self._is_spool_on_failure()
+        )
+        # Pending submissions are awaited at the end of publishing
+        context = self._instance.context
+        context.data.setdefault("deadlineSubmissionFutures", []).append(
+            future)
+        return future
+
+    @staticmethod
+    def _get_job_id(result):
+        """Job id or placeholder id of pending job from submission result."""
+        if isinstance(result, Future):
+            return result.placeholder_id
         return result["_id"]
+
+    def _add_job_dependencies(self, payload, dependency_ids):
+        job_info = payload["JobInfo"]
+        current = job_info.get("JobDependencies")
+        if current:
+            dependency_ids = [current] + list(dependency_ids)
+        job_info["JobDependencies"] = ",".join(dependency_ids)
+
+    def _post_job(self, payload, auth, verify):
+        """POST payload to Deadline jobs end-point.
+
+        When spooling of failed submissions is enabled in Settings, payload
+        is stored to be replayed later if Deadline Webservice is unavailable.
+
+        Returns:
+            dict: Deadline response of submitted job.
+
+        Throws:
+            KnownPublishError: if submission fails.
+
+        """
+        try:
+            result = post_or_spool(
+                self._deadline_url,
+                payload,
+                auth,
+                verify,
+                spool_on_failure=self._is_spool_on_failure()
+            )
+        except SubmissionError as exc:
+            self.log.error("Submission failed!")
+            self.log.error(exc)
+            self.log.debug(payload)
+            raise KnownPublishError(str(exc))
+
+        if result.get("spooled"):
+            self._instance.context.data.setdefault(
+                "deadlineSpooledSubmissions", []).append(result["_id"])
+        return result
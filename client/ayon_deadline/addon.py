@@ -1,15 +1,21 @@
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from typing import Optional, List
+from typing import Optional, List, Dict
 
-from ayon_core.addon import AYONAddon, IPluginPaths
+from ayon_core.addon import AYONAddon, IPluginPaths, click_wrap
 
 from .lib import (
     get_deadline_workers,
     get_deadline_groups,
     get_deadline_limit_groups,
-    get_deadline_pools
+    get_deadline_pools,
+    DeadlineInfoCache,
 )
+from .submission_queue import replay_spooled_submissions
+from .publish_daemon import DEFAULT_IDLE_TIMEOUT, run_publish_daemon
 from .version import __version__
 
 
@@ -40,6 +46,10 @@ class DeadlineAddon(AYONAddon, IPluginPaths):
         self._groups_by_server_name = {}
         self._machines_by_server_name = {}
 
+        self._info_cache = DeadlineInfoCache()
+        self._refresh_lock = threading.Lock()
+        self._refreshing_items = set()
+
     def get_plugin_paths(self):
         """Deadline plugin paths."""
         # Note: We are not returning `publish` key because we have overridden
@@ -58,6 +68,30 @@ class DeadlineAddon(AYONAddon, IPluginPaths):
             paths.append(os.path.join(publish_dir, host_name))
         return paths
 
+    def cli(self, click_group):
+        click_group.add_command(cli_main.to_click_obj())
+
+    def replay_spooled_submissions(self) -> Dict[str, str]:
+        """Submit jobs spooled while Deadline Webservice was unavailable.
+
+        Returns:
+            Dict[str, str]: Submitted job ids by placeholder ids.
+
+        """
+        return replay_spooled_submissions(
+            get_auth=self._get_auth_by_url, log=self.log)
+
+    def _get_auth_by_url(self, url: str) -> Optional[tuple]:
+        for dl_server_info in self.deadline_servers_info.values():
+            server_url = dl_server_info["value"].strip().rstrip("/")
+            if not url.startswith(server_url):
+                continue
+            if not dl_server_info.get("require_authentication"):
+                return None
+            return (dl_server_info["default_username"],
+                    dl_server_info["default_password"])
+        return None
+
     def get_pools_by_server_name(self, server_name: str) -> List[str]:
         """Returns dictionary of pools per DL server
 
@@ -68,19 +102,7 @@ class DeadlineAddon(AYONAddon, IPluginPaths):
             Dict[str, List[str]]: {"default": ["pool1", "pool2"]}
 
         """
-        pools = self._pools_by_server_name.get(server_name)
-        if pools is None:
-            dl_server_info = self.deadline_servers_info[server_name]
-
-            auth = (dl_server_info["default_username"],
-                    dl_server_info["default_password"])
-            pools = get_deadline_pools(
-                dl_server_info["value"],
-                auth
-            )
-            self._pools_by_server_name[server_name] = pools
-
-        return pools
+        return self._get_server_items(server_name, "pools")
 
     def get_groups_by_server_name(self, server_name: str) -> List[str]:
         """Returns dictionary of groups per DL server
@@ -92,19 +114,7 @@ class DeadlineAddon(AYONAddon, IPluginPaths):
             Dict[str, List[str]]: {"default": ["group1", "group2"]}
 
         """
-        groups = self._groups_by_server_name.get(server_name)
-        if groups is None:
-            dl_server_info = self.deadline_servers_info[server_name]
-
-            auth = (dl_server_info["default_username"],
-                    dl_server_info["default_password"])
-            groups = get_deadline_groups(
-                dl_server_info["value"],
-                auth
-            )
-            self._groups_by_server_name[server_name] = groups
-
-        return groups
+        return self._get_server_items(server_name, "groups")
 
     def get_limit_groups_by_server_name(self, server_name: str) -> List[str]:
         """Returns dictionary of limit groups per DL server
@@ -116,19 +126,7 @@ class DeadlineAddon(AYONAddon, IPluginPaths):
             Dict[str, List[str]]: {"default": ["limit1", "limit2"]}
 
         """
-        limit_groups = self._limit_groups_by_server_name.get(server_name)
-        if limit_groups is None:
-            dl_server_info = self.deadline_servers_info[server_name]
-
-            auth = (dl_server_info["default_username"],
-                    dl_server_info["default_password"])
-            limit_groups = get_deadline_limit_groups(
-                dl_server_info["value"],
-                auth
-            )
-            self._limit_groups_by_server_name[server_name] = limit_groups
-
-        return limit_groups
+        return self._get_server_items(server_name, "limitgroups")
 
     def get_machines_by_server_name(self, server_name: str) -> List[str]:
         """Returns dictionary of machines/workers per DL server
@@ -140,16 +138,159 @@ class DeadlineAddon(AYONAddon, IPluginPaths):
             Dict[str, List[str]]: {"default": ["renderNode1", "PC1"]}
 
         """
-        machines = self._machines_by_server_name.get(server_name)
-        if machines is None:
-            dl_server_info = self.deadline_servers_info[server_name]
+        return self._get_server_items(server_name, "workers")
 
-            auth = (dl_server_info["default_username"],
-                    dl_server_info["default_password"])
-            machines = get_deadline_workers(
-                dl_server_info["value"],
-                auth
+    def prefetch_server_metadata(self, server_name: str):
+        """Fetch pools, groups, limit groups and workers of DL server.
+
+        All items are queried concurrently so the waiting time is roughly
+        the one of the slowest request instead of their sum. Results are
+        stored to the same caches as used by `get_*_by_server_name` methods.
+
+        Args:
+            server_name (str): Deadline Server name from Project Settings.
+
+        """
+        item_types = [
+            item_type
+            for item_type in _ITEM_GETTERS_BY_TYPE
+            if server_name not in self._get_items_by_server_name(item_type)
+        ]
+        if not item_types:
+            return
+
+        def _get_items(item_type):
+            start = time.time()
+            self._get_server_items(server_name, item_type)
+            self.log.debug(
+                "Deadline %s of server '%s' prefetched in %.3fs.",
+                item_type, server_name, time.time() - start
             )
-            self._machines_by_server_name[server_name] = machines
 
-        return machines
+        with ThreadPoolExecutor(max_workers=len(item_types)) as executor:
+            futures = [
+                executor.submit(_get_items, item_type)
+                for item_type in item_types
+            ]
+        for future in futures:
+            future.result()
+
+    def _get_items_by_server_name(self, item_type: str) -> Dict[str, list]:
+        return {
+            "pools": self._pools_by_server_name,
+            "groups": self._groups_by_server_name,
+            "limitgroups": self._limit_groups_by_server_name,
+            "workers": self._machines_by_server_name,
+        }[item_type]
+
+    def _get_server_items(self, server_name: str, item_type: str) -> List[str]:
+        """Get items of Deadline server using in-process and on-disk cache.
+
+        Items cached on disk are used even when stale, in that case they are
+        refreshed in background for next calls.
+
+        Args:
+            server_name (str): Deadline Server name from Project Settings.
+            item_type (str): One of 'pools', 'groups', 'limitgroups' or
+                'workers'.
+
+        Returns:
+            List[str]: Items of the Deadline server.
+
+        """
+        items_by_server_name = self._get_items_by_server_name(item_type)
+        items = items_by_server_name.get(server_name)
+        if items is not None:
+            return items
+
+        server_url = self.deadline_servers_info[server_name]["value"]
+        items, is_stale = self._info_cache.get(
+            server_name, server_url, item_type)
+        if items is None:
+            items = self._fetch_server_items(server_name, item_type)
+        elif is_stale:
+            self._refresh_server_items(server_name, item_type)
+
+        items_by_server_name[server_name] = items
+        return items
+
+    def _fetch_server_items(
+        self, server_name: str, item_type: str
+    ) -> List[str]:
+        dl_server_info = self.deadline_servers_info[server_name]
+        server_url = dl_server_info["value"]
+        auth = (dl_server_info["default_username"],
+                dl_server_info["default_password"])
+        getter = _ITEM_GETTERS_BY_TYPE[item_type]
+        items = getter(server_url, auth)
+        # Don't cache failed requests
+        if items:
+            self._info_cache.set(server_name, server_url, item_type, items)
+        return items
+
+    def _refresh_server_items(self, server_name: str, item_type: str):
+        """Refresh items of Deadline server in background thread."""
+        key = (server_name, item_type)
+        with self._refresh_lock:
+            if key in self._refreshing_items:
+                return
+            self._refreshing_items.add(key)
+
+        def _refresh():
+            try:
+                items = self._fetch_server_items(server_name, item_type)
+                if items:
+                    items_by_server_name = self._get_items_by_server_name(
+                        item_type)
+                    items_by_server_name[server_name] = items
+            except Exception:
+                self.log.debug(
+                    "Failed to refresh Deadline %s of server '%s'.",
+                    item_type, server_name, exc_info=True
+                )
+            finally:
+                with self._refresh_lock:
+                    self._refreshing_items.discard(key)
+
+        thread = threading.Thread(target=_refresh, daemon=True)
+        thread.start()
+
+
+_ITEM_GETTERS_BY_TYPE = {
+    "pools": get_deadline_pools,
+    "groups": get_deadline_groups,
+    "limitgroups": get_deadline_limit_groups,
+    "workers": get_deadline_workers,
+}
+
+
+@click_wrap.group(DeadlineAddon.name, help="Deadline addon related commands.")
+def cli_main():
+    pass
+
+
+@cli_main.command()
+def replay_submissions():
+    """Submit jobs spooled while Deadline Webservice was unavailable."""
+    from ayon_core.addon import AddonsManager
+
+    manager = AddonsManager()
+    deadline_addon = manager.get(DeadlineAddon.name)
+    deadline_addon.replay_spooled_submissions()
+
+
+@cli_main.command()
+@click_wrap.option(
+    "--state-file",
+    required=True,
+    help="Path where port and token of the daemon are stored."
+)
+@click_wrap.option(
+    "--idle-timeout",
+    type=int,
+    default=DEFAULT_IDLE_TIMEOUT,
+    help="Seconds without publish request after which the daemon exits."
+)
+def publish_daemon(state_file, idle_timeout):
+    """Run daemon publishing farm jobs of Ayon Deadline plug-in."""
+    run_publish_daemon(state_file, idle_timeout)
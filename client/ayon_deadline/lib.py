@@ -1,13 +1,19 @@
 import os
 import sys
 import json
-from dataclasses import dataclass, field, asdict
-from functools import partial
+import time
+import hashlib
+import tempfile
+import copy
+import re
+import bisect
+from dataclasses import dataclass, field, fields, asdict
+from functools import partial, lru_cache
 from typing import Optional, List, Tuple, Any, Dict
 
 import requests
 
-from ayon_core.lib import Logger
+from ayon_core.lib import Logger, get_launcher_local_dir
 
 # describes list of product typed used for plugin filtering for farm publishing
 FARM_FAMILIES = [
@@ -21,10 +27,17 @@ FARM_FAMILIES = [
     "deadline"
 ]
 
+# Frame number in file name, supports both `.1001.exr` and `_1001.exr`
+FRAME_PATTERN = "[_.](?P<index>(?P<padding>0*)\\d+)\\.\\D+\\d?$"
+
 # Constant defining where we store job environment variables on instance or
 # context data
 JOB_ENV_DATA_KEY: str = "farmJobEnv"
 
+# Environment variable of publish job with count of previous submissions of
+# missing frames
+MISSING_FRAMES_SUBMISSIONS_ENV: str = "AYON_MISSING_FRAMES_SUBMISSIONS"
+
 
 def get_ayon_render_job_envs() -> "dict[str, str]":
     """Get required env vars for valid render job submission."""
@@ -185,12 +198,661 @@ def _get_deadline_info(
     return response.json()
 
 
+class DeadlineInfoCache:
+    """Persistent on-disk cache of Deadline Webservice enumerations.
+
+    Stores pools, groups, limit groups and workers per Deadline server so
+    they don't have to be queried on each launch of a host. Each item type
+    is stored in its own json file which is replaced atomically, so
+    multiple processes can share the cache safely.
+
+    Cached items older than `ttl` are 'stale' and should be refreshed,
+    items older than `max_stale` are not used at all.
+
+    Args:
+        cache_dir (Optional[str]): Directory where cache files are stored.
+        ttl (Optional[float]): Seconds after which cached items are stale.
+        max_stale (Optional[float]): Seconds after which stale items are
+            not returned anymore.
+
+    """
+    default_ttl = 10 * 60
+    default_max_stale = 24 * 60 * 60
+
+    def __init__(self, cache_dir=None, ttl=None, max_stale=None):
+        if cache_dir is None:
+            cache_dir = get_launcher_local_dir("deadline", "webservice_cache")
+        if ttl is None:
+            ttl = self.default_ttl
+        if max_stale is None:
+            max_stale = self.default_max_stale
+        self._cache_dir = cache_dir
+        self._ttl = ttl
+        self._max_stale = max_stale
+        self._log = None
+
+    @property
+    def log(self):
+        if self._log is None:
+            self._log = Logger.get_logger(self.__class__.__name__)
+        return self._log
+
+    def get(
+        self, server_name: str, server_url: str, item_type: str
+    ) -> Tuple[Optional[List[str]], bool]:
+        """Get cached items of Deadline server.
+
+        Args:
+            server_name (str): Deadline server name from Settings.
+            server_url (str): Deadline Webservice url of the server.
+            item_type (str): Type of items, e.g. 'pools'.
+
+        Returns:
+            Tuple[Optional[List[str]], bool]: Cached items or None if
+                nothing usable is cached, and if the items are stale.
+
+        """
+        path = self._get_path(server_name, item_type)
+        try:
+            with open(path, "r") as stream:
+                data = json.load(stream)
+        except FileNotFoundError:
+            return None, False
+        except (OSError, ValueError):
+            self.log.debug(
+                "Failed to read Deadline cache file '%s'.", path,
+                exc_info=True
+            )
+            return None, False
+
+        if data.get("url") != server_url:
+            return None, False
+
+        age = time.time() - data.get("timestamp", 0)
+        if age > self._max_stale:
+            return None, False
+        return data.get("items"), age > self._ttl
+
+    def set(
+        self,
+        server_name: str,
+        server_url: str,
+        item_type: str,
+        items: List[str]
+    ):
+        """Store items of Deadline server to cache.
+
+        Args:
+            server_name (str): Deadline server name from Settings.
+            server_url (str): Deadline Webservice url of the server.
+            item_type (str): Type of items, e.g. 'pools'.
+            items (List[str]): Items to store.
+
+        """
+        data = {
+            "url": server_url,
+            "timestamp": time.time(),
+            "items": items,
+        }
+        path = self._get_path(server_name, item_type)
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as stream:
+                json.dump(data, stream)
+            os.replace(tmp_path, path)
+        except OSError:
+            self.log.debug(
+                "Failed to write Deadline cache file '%s'.", path,
+                exc_info=True
+            )
+
+    def _get_path(self, server_name, item_type):
+        # Server name may contain characters not allowed in filename
+        name_hash = hashlib.sha1(server_name.encode("utf-8")).hexdigest()
+        return os.path.join(
+            self._cache_dir, "{}_{}.json".format(name_hash, item_type)
+        )
+
+
 class DeadlineWebserviceError(Exception):
     """
     Exception to throw when connection to Deadline server fails.
     """
 
 
+class FileSequence:
+    """Sequence of files described by filename pattern and frames.
+
+    Paths of individual frames are created only when iterated so long
+    sequences don't need to hold path of every frame in memory.
+
+    Example:
+        >>> sequence = FileSequence("/out/beauty.####.exr", range(1, 101))
+        >>> sequence.hashed_path
+        '/out/beauty.####.exr'
+        >>> next(iter(sequence))
+        '/out/beauty.0001.exr'
+
+    Args:
+        path (str): Path with frame token as '%04d' or '####'.
+        frames (Iterable[int]): Frame numbers, `range` is kept as is.
+
+    """
+    def __init__(self, path, frames):
+        path = path.replace("\\", "/")
+        dirname, filename = os.path.split(path)
+        if "#" in filename:
+            parts = filename.split("#")
+            filename = "{}%0{}d{}".format(
+                parts[0], len(parts) - 1, parts[-1])
+
+        if not isinstance(frames, range):
+            frames = tuple(sorted(set(frames)))
+
+        self.dirname = dirname
+        self.filename = filename
+        self.frames = frames
+
+    @property
+    def padding(self):
+        match = re.search(r"%(0?\d*)d", self.filename)
+        if not match or not match.group(1):
+            return 0
+        return int(match.group(1))
+
+    @property
+    def hashed_path(self):
+        """Path with frame token replaced by '#' characters."""
+        filename = re.sub(
+            r"%0?\d*d", "#" * max(self.padding, 1), self.filename)
+        return self.join(filename)
+
+    def join(self, filename):
+        if not self.dirname:
+            return filename
+        return "{}/{}".format(self.dirname, filename)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self):
+        for frame in self.frames:
+            yield self.join(self.filename % frame)
+
+    def __repr__(self):
+        return "<{} {} [{} frames]>".format(
+            self.__class__.__name__, self.hashed_path, len(self))
+
+
+def iter_expected_file_groups(expected_files):
+    """Lists of expected files which belong to one output.
+
+    Files of each AOV of multi-AOV render are one group, files which are
+    not separated by AOV are one group together.
+
+    Args:
+        expected_files (Optional[list]): Expected files of instance, list
+            of file paths or list of dictionaries with file paths by AOV.
+
+    Yields:
+        List[str]: File paths of one output.
+
+    """
+    ungrouped = []
+    for item in expected_files or []:
+        if isinstance(item, dict):
+            for filepaths in item.values():
+                yield list(filepaths)
+        else:
+            ungrouped.append(item)
+    if ungrouped:
+        yield ungrouped
+
+
+def collapse_expected_files(filepaths):
+    """Collapse file paths of frames to sequences.
+
+    Frames are grouped by directory, file name around the frame number and
+    width of the frame number, so only frames with the same padding form a
+    sequence. Group with single frame is kept as separate file.
+
+    Files which belong to different outputs, e.g. AOVs, should be
+    collapsed separately, see `iter_expected_file_groups`.
+
+    Args:
+        filepaths (Iterable[str]): File paths.
+
+    Returns:
+        Tuple[List[FileSequence], List[str]]: Sequences and paths which
+            are not part of any sequence.
+
+    """
+    frame_regex = re.compile(FRAME_PATTERN)
+    indexes_by_key = {}
+    remainder = []
+    for filepath in filepaths:
+        filepath = filepath.replace("\\", "/")
+        dirname, filename = os.path.split(filepath)
+        match = frame_regex.search(filename)
+        if not match:
+            remainder.append(filepath)
+            continue
+        index = match.group("index")
+        key = (
+            dirname,
+            filename[:match.start("index")],
+            filename[match.end("index"):],
+            len(index)
+        )
+        indexes_by_key.setdefault(key, []).append(index)
+
+    sequences = []
+    for (dirname, head, tail, padding), indexes in indexes_by_key.items():
+        if len(indexes) > 1:
+            filename = "{}%0{}d{}".format(head, padding, tail)
+            sequences.append(FileSequence(
+                os.path.join(dirname, filename),
+                [int(index) for index in indexes]
+            ))
+            continue
+
+        for index in indexes:
+            remainder.append(
+                os.path.join(dirname, head + index + tail).replace("\\", "/"))
+    return sequences, remainder
+
+
+_FRAME_RANGE_REGEX = re.compile(
+    r"^(?P<start>-?\d+)"
+    r"(?:-(?P<end>-?\d+)(?:(?:x|step|by|:)(?P<step>\d+))?)?$",
+    re.IGNORECASE
+)
+
+
+class FrameRanges:
+    """Set of frames stored as sorted, disjoint and inclusive ranges.
+
+    Allows set operations with frame lists of long sequences without
+    holding every frame, or every filename, in memory.
+
+    Example:
+        >>> frames = FrameRanges.parse("1001-1100,1200")
+        >>> str(frames - FrameRanges.parse("1051-1100"))
+        '1001-1050,1200'
+        >>> str(FrameRanges.parse("1-100x2"))
+        '1-99x2'
+
+    Args:
+        ranges (Iterable[Tuple[int, int]]): Inclusive (start, end) ranges,
+            which can overlap and be in any order.
+
+    """
+    def __init__(self, ranges=()):
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        self.ranges = tuple(merged)
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Create from frame numbers.
+
+        Args:
+            frames (Iterable[int]): Frame numbers.
+
+        Returns:
+            FrameRanges: Frames collapsed to ranges.
+
+        """
+        ranges = []
+        for frame in sorted(set(frames)):
+            if ranges and frame == ranges[-1][1] + 1:
+                ranges[-1][1] = frame
+            else:
+                ranges.append([frame, frame])
+        return cls((start, end) for start, end in ranges)
+
+    @classmethod
+    def parse(cls, frame_list):
+        """Parse Deadline frame list.
+
+        Supports frames and ranges separated by commas or spaces, reversed
+        ranges ('100-1'), steps ('1-100x2', '1-100step2', '1-100by2',
+        '1-100:2') and negative frames ('-10--1').
+
+        Args:
+            frame_list (Union[str, Iterable[str]]): Frame list or its parts.
+
+        Returns:
+            FrameRanges: Parsed frames.
+
+        Raises:
+            ValueError: Frame list has invalid syntax.
+
+        """
+        if isinstance(frame_list, str):
+            frame_list = [frame_list]
+
+        ranges = []
+        for value in frame_list:
+            for token in re.split(r"[,\s]+", value.strip()):
+                if not token:
+                    continue
+                match = _FRAME_RANGE_REGEX.match(token)
+                if not match:
+                    raise ValueError(
+                        "Invalid frame range '{}'".format(token))
+
+                start = int(match.group("start"))
+                end = match.group("end")
+                end = start if end is None else int(end)
+                step = int(match.group("step") or 1)
+                if step < 1:
+                    raise ValueError(
+                        "Invalid frame step in '{}'".format(token))
+
+                # Reversed ranges render from 'start' down to 'end'
+                if start > end:
+                    frames = range(start, end - 1, -step)
+                else:
+                    frames = range(start, end + 1, step)
+
+                if step == 1:
+                    ranges.append((min(start, end), max(start, end)))
+                else:
+                    ranges.extend((frame, frame) for frame in frames)
+        return cls(ranges)
+
+    def difference(self, other):
+        """Frames which are not in 'other'.
+
+        Args:
+            other (FrameRanges): Frames to remove.
+
+        Returns:
+            FrameRanges: Remaining frames.
+
+        """
+        other_ranges = other.ranges
+        other_idx = 0
+        result = []
+        for start, end in self.ranges:
+            # Skip ranges of 'other' which end before this range
+            while (
+                other_idx < len(other_ranges)
+                and other_ranges[other_idx][1] < start
+            ):
+                other_idx += 1
+
+            current = start
+            idx = other_idx
+            while idx < len(other_ranges) and other_ranges[idx][0] <= end:
+                other_start, other_end = other_ranges[idx]
+                if other_start > current:
+                    result.append((current, other_start - 1))
+                current = max(current, other_end + 1)
+                # Range of 'other' may continue to next range
+                if other_end > end:
+                    break
+                idx += 1
+
+            if current <= end:
+                result.append((current, end))
+        return FrameRanges(result)
+
+    def union(self, other):
+        return FrameRanges(self.ranges + other.ranges)
+
+    def intersection(self, other):
+        return self.difference(self.difference(other))
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    def __bool__(self):
+        return bool(self.ranges)
+
+    def __iter__(self):
+        for start, end in self.ranges:
+            yield from range(start, end + 1)
+
+    def __contains__(self, frame):
+        idx = bisect.bisect_right(self.ranges, (frame, float("inf"))) - 1
+        return idx >= 0 and self.ranges[idx][1] >= frame
+
+    def __eq__(self, other):
+        if not isinstance(other, FrameRanges):
+            return NotImplemented
+        return self.ranges == other.ranges
+
+    def __str__(self):
+        """Frame list in Deadline syntax, e.g. '1001-1050,1200'.
+
+        Single frames with the same step between them are collapsed to
+        stepped range, e.g. '1-99x2'.
+        """
+        return ",".join(self._iter_range_strings())
+
+    def _iter_range_strings(self):
+        ranges = self.ranges
+        idx = 0
+        while idx < len(ranges):
+            start, end = ranges[idx]
+            if start != end:
+                yield "{}-{}".format(start, end)
+                idx += 1
+                continue
+
+            # Find single frames following with the same step
+            last_idx = idx
+            step = None
+            while last_idx + 1 < len(ranges):
+                next_start, next_end = ranges[last_idx + 1]
+                if next_start != next_end:
+                    break
+                next_step = next_start - ranges[last_idx][0]
+                if step is not None and next_step != step:
+                    break
+                step = next_step
+                last_idx += 1
+
+            # Stepped range is shorter only for 3 and more frames
+            if last_idx - idx >= 2:
+                yield "{}-{}x{}".format(start, ranges[last_idx][0], step)
+                idx = last_idx + 1
+            else:
+                yield str(start)
+                idx += 1
+
+    def __repr__(self):
+        return "<{} {}>".format(self.__class__.__name__, self)
+
+
+class DirectoryIndex:
+    """Listing of directories shared by plugins during publishing.
+
+    Each directory is listed with `os.scandir` only once, representations
+    of all AOVs usually share one staging directory. Entries cache their
+    `stat` result, so size and modification time of a file are queried at
+    most once and only when needed.
+
+    Listing reflects state of directory when it was first listed, use
+    `invalidate` if files are created or removed meanwhile.
+    """
+    def __init__(self):
+        self._entries_by_dir = {}
+
+    @staticmethod
+    def _normalize(dirpath):
+        return os.path.normcase(os.path.abspath(dirpath))
+
+    def get_entries(self, dirpath):
+        """Files in directory.
+
+        Args:
+            dirpath (str): Directory path.
+
+        Returns:
+            Dict[str, os.DirEntry]: Entries of files by file name.
+
+        """
+        key = self._normalize(dirpath)
+        entries = self._entries_by_dir.get(key)
+        if entries is None:
+            with os.scandir(dirpath) as scandir_iter:
+                entries = {
+                    entry.name: entry
+                    for entry in scandir_iter
+                    if entry.is_file()
+                }
+            self._entries_by_dir[key] = entries
+        return entries
+
+    def get_filenames(self, dirpath):
+        """Names of files in directory.
+
+        Returns:
+            Set[str]: File names.
+
+        """
+        return set(self.get_entries(dirpath))
+
+    def stat(self, dirpath, filename):
+        """Cached stat result of file in directory.
+
+        Returns:
+            os.stat_result: Stat of the file.
+
+        Raises:
+            KeyError: File is not in the directory.
+
+        """
+        return self.get_entries(dirpath)[filename].stat()
+
+    def invalidate(self, dirpath=None):
+        """Forget listing of directory, or of all directories."""
+        if dirpath is None:
+            self._entries_by_dir.clear()
+        else:
+            self._entries_by_dir.pop(self._normalize(dirpath), None)
+
+
+def get_directory_index(context):
+    """Directory index shared by plugins of the publish.
+
+    Args:
+        context (pyblish.api.Context): Publish context.
+
+    Returns:
+        DirectoryIndex: Index stored on context.
+
+    """
+    directory_index = context.data.get("deadlineDirectoryIndex")
+    if directory_index is None:
+        directory_index = DirectoryIndex()
+        context.data["deadlineDirectoryIndex"] = directory_index
+    return directory_index
+
+
+# Job properties of Deadline job document by JobInfo key
+_JOB_INFO_PROPS = {
+    "Plugin": "Plug",
+    "Name": "Name",
+    "BatchName": "Batch",
+    "UserName": "User",
+    "Department": "Dept",
+    "Comment": "Cmmt",
+    "Frames": "Frames",
+    "ChunkSize": "Chunk",
+    "Priority": "Pri",
+    "Group": "Grp",
+    "Pool": "Pool",
+    "SecondaryPool": "SecPool",
+    "ConcurrentTasks": "Conc",
+    "MachineLimit": "MachLmt",
+}
+
+
+def get_job_payload(job, environment=None):
+    """Submission payload which clones Deadline job.
+
+    Deadline Webservice returns job document with abbreviated properties,
+    this converts it back to JobInfo and PluginInfo, e.g. to submit the
+    same job for other frames. Dependencies and auxiliary files are not
+    cloned.
+
+    Args:
+        job (dict[str, Any]): Job document from Deadline Webservice.
+        environment (Optional[dict[str, str]]): Environment variables
+            overriding environment of the job.
+
+    Returns:
+        dict[str, Any]: Payload with 'JobInfo', 'PluginInfo' and
+            'AuxFiles'.
+
+    """
+    props = job["Props"]
+    job_info = {}
+    for key, prop in _JOB_INFO_PROPS.items():
+        value = props.get(prop)
+        if value not in (None, ""):
+            job_info[key] = value
+
+    if props.get("Limits"):
+        job_info["LimitGroups"] = ",".join(props["Limits"])
+
+    listed_workers = props.get("ListedSlaves")
+    if listed_workers:
+        key = "Whitelist" if props.get("White") else "Blacklist"
+        job_info[key] = ",".join(listed_workers)
+
+    for index, dirpath in enumerate(props.get("OutDir") or []):
+        job_info["OutputDirectory{}".format(index)] = dirpath
+
+    for index, filename in enumerate(props.get("OutFile") or []):
+        job_info["OutputFilename{}".format(index)] = filename
+
+    job_env = dict(props.get("Env") or {})
+    if environment:
+        job_env.update(environment)
+    for index, (key, value) in enumerate(sorted(job_env.items())):
+        job_info["EnvironmentKeyValue{}".format(index)] = "{}={}".format(
+            key, value)
+
+    for index in range(10):
+        value = props.get("Ex{}".format(index))
+        if value:
+            job_info["ExtraInfo{}".format(index)] = value
+
+    for index, (key, value) in enumerate(
+        sorted((props.get("ExDic") or {}).items())
+    ):
+        job_info["ExtraInfoKeyValue{}".format(index)] = "{}={}".format(
+            key, value)
+
+    return {
+        "JobInfo": job_info,
+        "PluginInfo": dict(props.get("PlugInfo") or {}),
+        # Mandatory for Deadline, may be empty
+        "AuxFiles": [],
+    }
+
+
 class DeadlineKeyValueVar(dict):
     """
 
@@ -239,10 +901,14 @@ class DeadlineIndexedVar(dict):
     Note: Iterating the instance is not guarantueed to be the order of the
           indices. To do so iterate with `sorted()`
 
+    All indices lower than the lowest possibly free index are used, so
+    appending does not have to scan from 0 each time.
+
     """
     def __init__(self, key):
         super(DeadlineIndexedVar, self).__init__()
         self.__key = key
+        self.__lowest_free_index = 0
 
     def serialize(self):
         key = self.__key
@@ -257,9 +923,10 @@ class DeadlineIndexedVar(dict):
 
     def next_available_index(self):
         # Add as first unused entry
-        i = 0
-        while i in self.keys():
+        i = self.__lowest_free_index
+        while i in self:
             i += 1
+        self.__lowest_free_index = i
         return i
 
     def update(self, data):
@@ -280,6 +947,41 @@ class DeadlineIndexedVar(dict):
             raise ValueError("Negative index can't be set: {}".format(key))
         dict.__setitem__(self, key, value)
 
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._index_freed(key)
+
+    def pop(self, key, *args):
+        had_key = key in self
+        value = dict.pop(self, key, *args)
+        if had_key:
+            self._index_freed(key)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._index_freed(key)
+        return key, value
+
+    def clear(self):
+        dict.clear(self)
+        self.__lowest_free_index = 0
+
+    def _index_freed(self, key):
+        if key < self.__lowest_free_index:
+            self.__lowest_free_index = key
+
+
+# JobInfo fields with list values posted as comma separated strings
+_COMMA_SEPARATED_FIELDS = {"LimitGroups", "Whitelist", "Blacklist"}
+
+
+@lru_cache(maxsize=None)
+def _get_field_names(dataclass_type) -> Tuple[str, ...]:
+    """Names of dataclass fields, cached per class."""
+    return tuple(dataclass_field.name for dataclass_field in fields(
+        dataclass_type))
+
 
 @dataclass
 class DeadlineJobInfo:
@@ -474,45 +1176,52 @@ class AYONDeadlineJobInfo(DeadlineJobInfo):
     def serialize(self):
         """Return all data serialized as dictionary.
 
+        Fields are walked once without copying indexed and key-value
+        variables, those are serialized directly to Deadline keys.
+
         Returns:
-            OrderedDict: all serialized data.
+            Dict[str, Any]: all serialized data.
 
-    """
-        def filter_data(a, v):
-            if isinstance(v, (DeadlineIndexedVar, DeadlineKeyValueVar)):
-                return False
-            if v is None:
-                return False
-            return True
-
-        serialized = asdict(self)
-        serialized = {
-            k: v for k, v in serialized.items()
-            if filter_data(k, v)
-        }
+        """
+        serialized = {}
+        variables = []
+        for field_name in _get_field_names(self.__class__):
+            value = getattr(self, field_name)
+            if value is None:
+                continue
+            if isinstance(value, (DeadlineIndexedVar, DeadlineKeyValueVar)):
+                variables.append(value)
+            elif field_name in _COMMA_SEPARATED_FIELDS:
+                serialized[field_name] = ",".join(value)
+            elif isinstance(value, (list, dict)):
+                serialized[field_name] = copy.copy(value)
+            else:
+                serialized[field_name] = value
 
         # Custom serialize these attributes
-        for attribute in [
-            self.EnvironmentKeyValue,
-            self.ExtraInfo,
-            self.ExtraInfoKeyValue,
-            self.TaskExtraInfoName,
-            self.OutputFilename,
-            self.OutputFilenameTile,
-            self.OutputDirectory,
-            self.AssetDependency
-        ]:
-            serialized.update(attribute.serialize())
-
-        for attribute_key in [
-            "LimitGroups",
-            "Whitelist",
-            "Blacklist",
-        ]:
-            serialized[attribute_key] = ",".join(serialized[attribute_key])
+        for variable in variables:
+            serialized.update(variable.serialize())
 
         return serialized
 
+    def copy(self) -> 'AYONDeadlineJobInfo':
+        """Return copy of job info.
+
+        Faster alternative to `deepcopy`, values are immutable apart from
+        lists and variables which are copied one level deep.
+
+        Returns:
+            AYONDeadlineJobInfo: Copy of job info.
+
+        """
+        job_info = self.__class__.__new__(self.__class__)
+        for field_name in _get_field_names(self.__class__):
+            value = getattr(self, field_name)
+            if isinstance(value, (list, dict)):
+                value = copy.copy(value)
+            setattr(job_info, field_name, value)
+        return job_info
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AYONDeadlineJobInfo':
 
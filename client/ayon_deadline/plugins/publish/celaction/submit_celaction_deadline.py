@@ -4,6 +4,7 @@ import pyblish.api
 from dataclasses import dataclass, field, asdict
 
 from ayon_deadline import abstract_submit_deadline
+from ayon_deadline.lib import FileSequence
 
 
 @dataclass
@@ -89,19 +90,15 @@ class CelactionSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline):
         if not instance.data.get("expectedFiles"):
             instance.data["expectedFiles"] = []
 
-        dirpath = os.path.dirname(filepath)
         filename = os.path.basename(filepath)
-
-        if "#" in filename:
-            pparts = filename.split("#")
-            padding = "%0{}d".format(len(pparts) - 1)
-            filename = pparts[0] + padding + pparts[-1]
-
-        if "%" not in filename:
+        if "#" not in filename and "%" not in filename:
             instance.data["expectedFiles"].append(filepath)
             return
 
-        for i in range(self._frame_start, (self._frame_end + 1)):
-            instance.data["expectedFiles"].append(
-                os.path.join(dirpath, (filename % i)).replace("\\", "/")
-            )
+        sequence = FileSequence(
+            filepath, range(self._frame_start, self._frame_end + 1))
+        instance.data["expectedFiles"].extend(sequence)
+        # Job outputs are registered from the sequence, not guessed from
+        #   expected files
+        instance.data.setdefault("expectedFileSequences", []).append(
+            sequence)
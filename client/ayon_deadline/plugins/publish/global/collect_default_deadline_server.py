@@ -2,6 +2,10 @@
 """Collect default Deadline server."""
 import pyblish.api
 
+from ayon_deadline.abstract_submit_deadline import (
+    configure_deadline_sessions,
+)
+
 
 class CollectDefaultDeadlineServer(pyblish.api.ContextPlugin):
     """Collect default Deadline Webservice URL.
@@ -32,6 +36,11 @@ class CollectDefaultDeadlineServer(pyblish.api.ContextPlugin):
         deadline_settings = context.data["project_settings"]["deadline"]
         deadline_server_name = deadline_settings["deadline_server"]
 
+        configure_deadline_sessions(
+            deadline_settings.get("webservice_pool_size"),
+            deadline_settings.get("webservice_max_retries"),
+        )
+
         dl_server_info = None
         if deadline_server_name:
             dl_server_info = deadline_addon.deadline_servers_info.get(
@@ -116,6 +116,7 @@ class CollectJobInfo(pyblish.api.InstancePlugin, AYONPyblishPluginMixin):
         addons_manager = AddonsManager(project_settings)
         deadline_addon = addons_manager["deadline"]
         deadline_server_name = settings["deadline_server"]
+        deadline_addon.prefetch_server_metadata(deadline_server_name)
         pools = deadline_addon.get_pools_by_server_name(deadline_server_name)
         cls.pool_enum_values = [
             {"value": pool, "label": pool}
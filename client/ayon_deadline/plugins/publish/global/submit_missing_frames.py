@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""Submit render of missing frames instead of failing farm publish."""
+import os
+
+import requests
+import pyblish.api
+
+from ayon_core.pipeline.publish import KnownPublishError
+from ayon_deadline.abstract_submit_deadline import (
+    requests_get,
+    requests_delete,
+)
+from ayon_deadline.lib import (
+    MISSING_FRAMES_SUBMISSIONS_ENV,
+    FrameRanges,
+    get_job_payload,
+)
+from ayon_deadline.submission_queue import post_payload
+
+
+class SubmitMissingFrames(pyblish.api.ContextPlugin):
+    """Render missing frames again and publish once they are rendered.
+
+    `ValidateExpectedFiles` marks instances with missing frames when
+    submission of missing frames is enabled in Settings. Render jobs of
+    this publish job are cloned to render only the missing frames and this
+    publish job is cloned to depend on them. Publishing of all instances is
+    then skipped, the new publish job publishes them all.
+
+    Runs after all validators passed, so failed publish doesn't leave
+    submitted jobs behind. Render jobs and publish job are submitted as one
+    batch, already submitted render jobs are deleted if any submission of
+    the batch fails.
+    """
+
+    label = "Submit missing frames to Deadline"
+    order = pyblish.api.ExtractorOrder - 0.49
+    targets = ["deadline"]
+    settings_category = "deadline"
+
+    def process(self, context):
+        instances = [
+            instance
+            for instance in context
+            if instance.data.get("deadlineSubmitMissingFrames")
+        ]
+        if not instances:
+            return
+
+        publish_job_id = os.environ.get("AYON_PUBLISH_JOB_ID")
+        if not publish_job_id:
+            raise KnownPublishError(
+                "Publish job id is not available, missing frames can't be"
+                " submitted. Make sure GlobalJobPreLoad is up to date."
+            )
+
+        missing_frames = FrameRanges()
+        render_job_ids = []
+        for instance in instances:
+            for item in instance.data["deadlineMissingFrames"]:
+                missing_frames |= FrameRanges.parse(item["frames"])
+            render_job_ids.extend(self._get_render_job_ids(instance))
+        render_job_ids = list(dict.fromkeys(render_job_ids))
+
+        deadline_data = instances[0].data["deadline"]
+        deadline_url = deadline_data["url"]
+        auth = deadline_data["auth"]
+        verify = deadline_data["verify"]
+
+        jobs = self._get_jobs(
+            deadline_url, render_job_ids + [publish_job_id], auth, verify)
+
+        render_jobs = []
+        for job_id in render_job_ids:
+            job = jobs.get(job_id)
+            if job is None:
+                self.log.warning(
+                    "Job '{}' was not found on Deadline.".format(job_id))
+                continue
+            # Validate all jobs before anything is submitted
+            self._validate_render_job(job)
+            render_jobs.append(job)
+
+        render_payloads = []
+        for job in render_jobs:
+            job_id = job["_id"]
+            job_frames = FrameRanges.parse(job["Props"].get("Frames") or "")
+            frames = job_frames & missing_frames
+            if not frames:
+                continue
+
+            payload = get_job_payload(job)
+            payload["JobInfo"]["Frames"] = str(frames)
+            payload["JobInfo"]["Name"] = "{} - missing frames".format(
+                payload["JobInfo"].get("Name", job_id))
+            self.log.info(
+                "Submitting frames {} of render job '{}'".format(
+                    frames, job_id)
+            )
+            render_payloads.append(payload)
+
+        if not render_payloads:
+            raise KnownPublishError(
+                "Missing frames {} are not rendered by any render job of"
+                " this publish.".format(missing_frames)
+            )
+
+        publish_job = jobs.get(publish_job_id)
+        if publish_job is None:
+            raise KnownPublishError(
+                "Publish job '{}' was not found on Deadline.".format(
+                    publish_job_id)
+            )
+
+        submissions = int(os.environ.get(MISSING_FRAMES_SUBMISSIONS_ENV) or 0)
+        publish_payload = get_job_payload(
+            publish_job,
+            environment={MISSING_FRAMES_SUBMISSIONS_ENV: str(submissions + 1)}
+        )
+
+        new_render_job_ids, publish_result = self._submit_batch(
+            deadline_url, render_payloads, publish_payload, auth, verify)
+
+        self.log.info(
+            "Submitted render jobs {} of missing frames {} and publish job"
+            " '{}'. Skipping publishing.".format(
+                ", ".join(new_render_job_ids),
+                missing_frames,
+                publish_result["_id"]
+            )
+        )
+        # Instances which are not published are skipped by following
+        #   plugins, new publish job publishes all of them
+        for instance in context:
+            instance.data["publish"] = False
+
+    def _submit_batch(
+        self, deadline_url, render_payloads, publish_payload, auth, verify
+    ):
+        """Submit render jobs and publish job depending on them.
+
+        Render jobs which were already submitted are deleted when any
+        submission fails, so there are no render jobs without publish job.
+
+        Returns:
+            tuple[list[str], dict]: Render job ids and Deadline response of
+                publish job.
+
+        """
+        render_job_ids = []
+        try:
+            for payload in render_payloads:
+                result = post_payload(deadline_url, payload, auth, verify)
+                render_job_ids.append(result["_id"])
+
+            publish_payload["JobInfo"]["JobDependencies"] = ",".join(
+                render_job_ids)
+            publish_result = post_payload(
+                deadline_url, publish_payload, auth, verify)
+        except Exception:
+            self._delete_jobs(deadline_url, render_job_ids, auth, verify)
+            raise
+        return render_job_ids, publish_result
+
+    def _delete_jobs(self, deadline_url, job_ids, auth, verify):
+        if not job_ids:
+            return
+        self.log.info(
+            "Deleting submitted render jobs {}".format(", ".join(job_ids)))
+        url = "{}/api/jobs?JobID={}".format(deadline_url, ",".join(job_ids))
+        try:
+            response = requests_delete(url, auth=auth, verify=verify)
+        except requests.exceptions.RequestException as exc:
+            self.log.error(
+                "Failed to delete render jobs {}: {}".format(
+                    ", ".join(job_ids), exc)
+            )
+            return
+        if not response.ok:
+            self.log.error(
+                "Failed to delete render jobs {}: {}".format(
+                    ", ".join(job_ids), response.text)
+            )
+
+    def _validate_render_job(self, job):
+        """Job renders the frames, cloning it renders them again.
+
+        Jobs which depend on other jobs, e.g. assembly of tiles, only
+        process output of those jobs.
+
+        Raises:
+            KnownPublishError: Job doesn't render the frames.
+
+        """
+        props = job["Props"]
+        if props.get("Plug") == "DraftTileAssembler" or props.get("Dep"):
+            raise KnownPublishError(
+                "Job '{}' ({}) doesn't render the frames itself, missing"
+                " frames can't be rendered again.".format(
+                    job["_id"], props.get("Name"))
+            )
+
+    def _get_render_job_ids(self, instance):
+        job_ids_env = os.environ.get("RENDER_JOB_IDS")
+        if job_ids_env:
+            return job_ids_env.split(",")
+        job_id = instance.data.get("render_job_id")
+        if job_id:
+            return [job_id]
+        return []
+
+    def _get_jobs(self, deadline_url, job_ids, auth, verify):
+        """Query jobs from Deadline.
+
+        Args:
+            deadline_url (str): Deadline Webservice url.
+            job_ids (list[str]): Deadline job ids.
+            auth (Optional[tuple]): (username, password)
+            verify (Optional[bool]): Verify SSL certificate if present.
+
+        Returns:
+            dict[str, dict]: Job documents by job id.
+
+        """
+        url = "{}/api/jobs?JobID={}".format(deadline_url, ",".join(job_ids))
+        try:
+            response = requests_get(url, auth=auth, verify=verify)
+        except requests.exceptions.ConnectionError:
+            raise KnownPublishError(
+                "Deadline is not accessible at {}".format(deadline_url))
+
+        if not response.ok:
+            raise KnownPublishError(
+                "Querying jobs from Deadline failed: {}".format(
+                    response.text)
+            )
+        return {
+            job["_id"]: job
+            for job in response.json() or []
+        }
@@ -20,7 +20,11 @@ from ayon_core.pipeline.farm.pyblish_functions import (
     prepare_representations,
     create_metadata_path
 )
-from ayon_deadline.abstract_submit_deadline import requests_post
+from ayon_deadline.submission_queue import (
+    post_or_spool,
+    resolve_job_id,
+    resolve_submission_job,
+)
 
 
 def get_resource_files(resources, frame_range=None):
@@ -262,7 +266,7 @@ class ProcessSubmittedJobOnFarm(pyblish.api.InstancePlugin,
             job_index = 0
             for assembly_id in instance.data.get("assemblySubmissionJobs"):
                 payload["JobInfo"]["JobDependency{}".format(
-                    job_index)] = assembly_id  # noqa: E501
+                    job_index)] = resolve_job_id(assembly_id)  # noqa: E501
                 job_index += 1
         elif instance.data.get("bakingSubmissionJobs"):
             self.log.info(
@@ -271,7 +275,7 @@ class ProcessSubmittedJobOnFarm(pyblish.api.InstancePlugin,
             job_index = 0
             for assembly_id in instance.data["bakingSubmissionJobs"]:
                 payload["JobInfo"]["JobDependency{}".format(
-                    job_index)] = assembly_id  # noqa: E501
+                    job_index)] = resolve_job_id(assembly_id)  # noqa: E501
                 job_index += 1
         elif job.get("_id"):
             payload["JobInfo"]["JobDependency0"] = job["_id"]
@@ -290,15 +294,22 @@ class ProcessSubmittedJobOnFarm(pyblish.api.InstancePlugin,
 
         self.log.debug("Submitting Deadline publish job ...")
 
-        url = "{}/api/jobs".format(self.deadline_url)
         auth = instance.data["deadline"]["auth"]
         verify = instance.data["deadline"]["verify"]
-        response = requests_post(
-            url, json=payload, timeout=10, auth=auth, verify=verify)
-        if not response.ok:
-            raise Exception(response.text)
+        project_settings = instance.context.data["project_settings"]
+        result = post_or_spool(
+            self.deadline_url,
+            payload,
+            auth,
+            verify,
+            spool_on_failure=project_settings["deadline"].get(
+                "spool_failed_submissions", False)
+        )
+        if result.get("spooled"):
+            instance.context.data.setdefault(
+                "deadlineSpooledSubmissions", []).append(result["_id"])
 
-        deadline_publish_job_id = response.json()["_id"]
+        deadline_publish_job_id = result["_id"]
 
         return deadline_publish_job_id
 
@@ -416,7 +427,10 @@ class ProcessSubmittedJobOnFarm(pyblish.api.InstancePlugin,
 
         '''
 
-        render_job = instance.data.pop("deadlineSubmissionJob", None)
+        # Publish job and metadata need Deadline response of render job,
+        #   asynchronous submission of render job is awaited here
+        render_job = resolve_submission_job(
+            instance.data.pop("deadlineSubmissionJob", None))
         if not render_job and instance.data.get("tileRendering") is False:
             raise AssertionError(("Cannot continue without valid "
                                   "Deadline submission."))
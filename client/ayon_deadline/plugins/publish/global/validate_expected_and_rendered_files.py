@@ -1,11 +1,25 @@
 import os
+import time
+import statistics
 import requests
 from collections.abc import Iterable
 
 import pyblish.api
 import clique
 
-from ayon_deadline.abstract_submit_deadline import requests_get
+from ayon_core.pipeline import PublishValidationError
+from ayon_deadline.abstract_submit_deadline import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_RETRIES,
+    RETRY_STATUS_CODES,
+    requests_get,
+)
+from ayon_deadline.lib import (
+    FRAME_PATTERN,
+    MISSING_FRAMES_SUBMISSIONS_ENV,
+    FrameRanges,
+    get_directory_index,
+)
 
 
 class ValidateExpectedFiles(pyblish.api.InstancePlugin):
@@ -20,6 +34,18 @@ class ValidateExpectedFiles(pyblish.api.InstancePlugin):
     # check if actual frame range on render job wasn't different
     # case when artists wants to render only subset of frames
     allow_user_override = True
+    # seconds for querying all dependent jobs from Deadline
+    job_info_timeout = 60
+    # maximum job ids queried by one request
+    job_info_batch_size = 50
+    # consider empty files as missing and warn about truncated files
+    check_file_sizes = False
+    # files smaller than this ratio of median size are considered truncated
+    truncated_size_ratio = 0.1
+    # submit render of missing frames with new publish job instead of failing
+    submit_missing_frames = False
+    # maximum submissions of missing frames for one render
+    max_missing_frames_submissions = 1
 
     def process(self, instance):
         """Process all the nodes in the instance"""
@@ -35,55 +61,202 @@ class ValidateExpectedFiles(pyblish.api.InstancePlugin):
         # get list of frames from dependent jobs
         frame_list = self._get_dependent_jobs_frames(
             instance, dependent_job_ids)
+        job_frames = FrameRanges.parse(frame_list)
 
+        missing_items = []
         for repre in instance.data["representations"]:
             expected_files = self._get_expected_files(repre)
 
             staging_dir = repre["stagingDir"]
-            existing_files = self._get_existing_files(staging_dir)
-
-            if self.allow_user_override:
-                # We always check for user override because the user might have
-                # also overridden the Job frame list to be longer than the
-                # originally submitted frame range
-                # todo: We should first check if Job frame range was overridden
-                #       at all so we don't unnecessarily override anything
-                collection_or_filename = self._get_collection(expected_files)
-                job_expected_files = self._get_job_expected_files(
-                    collection_or_filename, frame_list)
-
-                job_files_diff = job_expected_files.difference(expected_files)
-                if job_files_diff:
-                    self.log.debug(
-                        "Detected difference in expected output files from "
-                        "Deadline job. Assuming an updated frame list by the "
-                        "user. Difference: {}".format(sorted(job_files_diff))
-                    )
-
-                    # Update the representation expected files
-                    self.log.info("Update range from actual job range "
-                                  "to frame list: {}".format(frame_list))
-                    # single item files must be string not list
-                    repre["files"] = (sorted(job_expected_files)
-                                      if len(job_expected_files) > 1 else
-                                      list(job_expected_files)[0])
-
-                    # Update the expected files
-                    expected_files = job_expected_files
+            existing_files = self._get_existing_files(instance, staging_dir)
+
+            collection_or_filename = self._get_collection(expected_files)
+            # no frames in file name at all, so it is a single file
+            # eg 'renderCompositingMain.withLut.mov'
+            collection = None
+            missing_frames = FrameRanges()
+            if isinstance(collection_or_filename, str):
+                missing = expected_files - existing_files
+                present_files = expected_files & existing_files
+            else:
+                collection = collection_or_filename
+                expected_frames = FrameRanges.from_frames(collection.indexes)
+                # files of representation which are not part of the sequence
+                other_files = {
+                    filename
+                    for filename in expected_files
+                    if not collection.match(filename)
+                }
+
+                if self.allow_user_override:
+                    # We always check for user override because the user might
+                    # have also overridden the Job frame list to be longer than
+                    # the originally submitted frame range
+                    job_frames_diff = job_frames - expected_frames
+                    if job_frames_diff:
+                        self.log.debug(
+                            "Detected difference in expected output files "
+                            "from Deadline job. Assuming an updated frame "
+                            "list by the user. Difference: {}".format(
+                                job_frames_diff)
+                        )
+
+                        # Update the representation expected files
+                        self.log.info("Update range from actual job range "
+                                      "to frame list: {}".format(job_frames))
+                        job_expected_files = self._get_frames_filenames(
+                            collection, job_frames)
+                        # single item files must be string not list
+                        repre["files"] = (job_expected_files
+                                          if len(job_expected_files) > 1 else
+                                          job_expected_files[0])
+
+                        # Update the expected files
+                        expected_files = set(job_expected_files)
+                        expected_frames = job_frames
+                        other_files = set()
+
+                # Compare frames as ranges, names of missing frames are not
+                # needed for the report
+                existing_frames = self._get_existing_frames(
+                    collection, existing_files)
+                missing_frames = expected_frames - existing_frames
+                missing = other_files - existing_files
+                present_files = None
+                if self.check_file_sizes:
+                    present_files = set(self._get_frames_filenames(
+                        collection, expected_frames & existing_frames))
+                    present_files.update(other_files & existing_files)
+
+            if self.check_file_sizes:
+                empty_files = self._get_empty_files(
+                    instance, staging_dir, present_files)
+                if collection is not None:
+                    missing_frames |= self._get_existing_frames(
+                        collection, empty_files)
+                    empty_files = {
+                        filename
+                        for filename in empty_files
+                        if not collection.match(filename)
+                    }
+                missing.update(empty_files)
 
             # We don't use set.difference because we do allow other existing
             # files to be in the folder that we might not want to use.
-            missing = expected_files - existing_files
-            if missing:
-                raise RuntimeError(
-                    "Missing expected files: {}\n"
-                    "Expected files: {}\n"
-                    "Existing files: {}".format(
-                        sorted(missing),
-                        sorted(expected_files),
-                        sorted(existing_files)
-                    )
-                )
+            if missing or missing_frames:
+                missing_items.append({
+                    "representation": repre["name"],
+                    "stagingDir": staging_dir,
+                    "pattern": (
+                        collection.format("{head}{padding}{tail}")
+                        if collection is not None else None
+                    ),
+                    "frames": str(missing_frames),
+                    "frameCount": len(missing_frames),
+                    "files": sorted(missing),
+                })
+
+        # Store missing frames, so they can be rendered again
+        instance.data["deadlineMissingFrames"] = missing_items
+        if not missing_items:
+            return
+
+        message = "Missing expected files of '{}':\n{}".format(
+            instance.data.get("productName", instance.name),
+            self._format_missing_items(missing_items)
+        )
+        if not self._can_submit_missing_frames(instance, missing_items):
+            raise PublishValidationError(message)
+
+        # 'SubmitMissingFrames' submits the render and skips publishing
+        self.log.warning(
+            "{}\nMissing frames will be rendered again.".format(message))
+        instance.data["deadlineSubmitMissingFrames"] = True
+
+    def _is_submit_missing_frames_enabled(self, context):
+        """'SubmitMissingFrames' plugin will process marked instances.
+
+        Args:
+            context (pyblish.api.Context): Publish context.
+
+        Returns:
+            bool: Plugin is enabled in Settings.
+
+        """
+        publish_settings = (
+            context.data["project_settings"]["deadline"]["publish"])
+        plugin_settings = publish_settings.get("SubmitMissingFrames") or {}
+        return plugin_settings.get("enabled", True)
+
+    def _can_submit_missing_frames(self, instance, missing_items):
+        """Missing frames can be rendered again instead of failing.
+
+        Args:
+            instance (pyblish.api.Instance): pyblish instance
+            missing_items (list[dict]): Missing files of representations.
+
+        Returns:
+            bool: Render of missing frames can be submitted.
+
+        """
+        if not self.submit_missing_frames:
+            return False
+
+        if not self._is_submit_missing_frames_enabled(instance.context):
+            self.log.info(
+                "'SubmitMissingFrames' is disabled in Settings, missing"
+                " frames can't be rendered again."
+            )
+            return False
+
+        if instance.data.get("tileRendering"):
+            self.log.info(
+                "Tiles are assembled from other render jobs, missing frames"
+                " can't be rendered again."
+            )
+            return False
+
+        if any(item["files"] for item in missing_items):
+            self.log.info(
+                "Missing files are not part of a sequence, missing frames"
+                " can't be rendered again."
+            )
+            return False
+
+        submissions = int(
+            os.environ.get(MISSING_FRAMES_SUBMISSIONS_ENV) or 0)
+        if submissions >= self.max_missing_frames_submissions:
+            self.log.info(
+                "Missing frames were already submitted {} times.".format(
+                    submissions)
+            )
+            return False
+        return True
+
+    def _format_missing_items(self, missing_items):
+        """Returns report of missing files with frames collapsed to ranges.
+
+        Args:
+            missing_items (list[dict]): Missing files of representations.
+
+        Returns:
+            str: Report with a line for each sequence or file.
+
+        """
+        lines = []
+        for item in missing_items:
+            if item["frames"]:
+                lines.append("{} [{}] {}: {} ({} frames)".format(
+                    item["representation"],
+                    item["stagingDir"],
+                    item["pattern"],
+                    item["frames"],
+                    item["frameCount"],
+                ))
+            for filename in item["files"]:
+                lines.append("{} [{}] {}".format(
+                    item["representation"], item["stagingDir"], filename))
+        return "\n".join(lines)
 
     def _get_dependent_job_ids(self, instance):
         """Returns list of dependent job ids from instance metadata.json
@@ -122,45 +295,53 @@ class ValidateExpectedFiles(pyblish.api.InstancePlugin):
         """
         all_frame_lists = []
 
+        jobs_info = self._get_jobs_info(instance, dependent_job_ids)
         for job_id in dependent_job_ids:
-            job_info = self._get_job_info(instance, job_id)
+            job_info = jobs_info.get(job_id)
+            if not job_info:
+                self.log.warning(
+                    "Job '{}' was not found on Deadline.".format(job_id))
+                continue
             frame_list = job_info["Props"].get("Frames")
             if frame_list:
                 all_frame_lists.extend(frame_list.split(','))
 
         return all_frame_lists
 
-    def _get_job_expected_files(self,
-                                collection_or_filename,
-                                frame_list):
-        """Calculates list of names of expected rendered files.
+    def _get_existing_frames(self, collection, existing_files):
+        """Returns frames of the sequence which exist in staging directory.
+
+        Args:
+            collection (clique.Collection): Expected sequence.
+            existing_files (Iterable[str]): Existing file names.
+
+        Returns:
+            FrameRanges: Existing frames.
+
+        """
+        frames = []
+        for filename in existing_files:
+            match = collection.match(filename)
+            if match:
+                frames.append(int(match.group("index")))
+        return FrameRanges.from_frames(frames)
+
+    def _get_frames_filenames(self, collection, frames):
+        """Returns file names of the sequence for frames.
 
-        Might be different from expected files from submission if user
-        explicitly and manually changed the frame list on the Deadline job.
+        Args:
+            collection (clique.Collection): Sequence.
+            frames (Iterable[int]): Frames to create file names for.
 
         Returns:
-            set: Set of expected file names in the staging directory.
+            list[str]: File names in order of frames.
 
         """
-        # no frames in file name at all, eg 'renderCompositingMain.withLut.mov'
-        # so it is a single file
-        if isinstance(collection_or_filename, str):
-            return {collection_or_filename}
-
-        # Define all frames from the frame list
-        all_frames = set()
-        for frames in frame_list:
-            if '-' not in frames:  # single frame
-                frames = "{}-{}".format(frames, frames)
-
-            start, end = frames.split('-')
-            all_frames.update(iter(range(int(start), int(end) + 1)))
-
-        # Return all filename for the collection with the new frames
-        collection: clique.Collection = collection_or_filename
-        collection.indexes.clear()
-        collection.indexes.update(all_frames)
-        return set(collection)  # return list of filenames
+        return [
+            "{0}{1:0{2}d}{3}".format(
+                collection.head, frame, collection.padding, collection.tail)
+            for frame in frames
+        ]
 
     def _get_collection(self, files) -> "Iterable[str]":
         """Returns sequence collection or a single filepath.
@@ -176,8 +357,7 @@ class ValidateExpectedFiles(pyblish.api.InstancePlugin):
         #  implementation in `ayon_core.lib.collect_frames`
         # clique.PATTERNS["frames"] supports only `.1001.exr` not `_1001.exr`
         # so we use a customized pattern.
-        pattern = "[_.](?P<index>(?P<padding>0*)\\d+)\\.\\D+\\d?$"
-        patterns = [pattern]
+        patterns = [FRAME_PATTERN]
         collections, remainder = clique.assemble(
             files, minimum_items=1, patterns=patterns)
         if collections:
@@ -186,52 +366,168 @@ class ValidateExpectedFiles(pyblish.api.InstancePlugin):
             # No sequence detected, we assume single frame
             return remainder[0]
 
-    def _get_job_info(self, instance, job_id):
-        """Calls DL for actual job info for 'job_id'
+    def _get_jobs_info(self, instance, job_ids):
+        """Calls DL for actual job info of all 'job_ids'
 
         Might be different than job info saved in metadata.json if user
         manually changes job pre/during rendering.
 
+        Jobs are queried in batches, Deadline Webservice accepts comma
+        separated job ids, so dependent jobs of tiled or baking publishes
+        don't need a request each. All requests, including retries, share
+        `job_info_timeout`.
+
         Args:
             instance (pyblish.api.Instance): pyblish instance
-            job_id (str): Deadline job id
+            job_ids (list[str]): Deadline job ids
 
         Returns:
-            (dict): Job info from Deadline
+            dict[str, dict]: Job info from Deadline by job id. Jobs which
+                were not found are not included.
+
+        Raises:
+            PublishValidationError: Job info could not be fetched.
 
         """
         deadline_url = instance.data["deadline"]["url"]
         assert deadline_url, "Requires Deadline Webservice URL"
 
-        url = "{}/api/jobs?JobID={}".format(deadline_url, job_id)
-        try:
-            kwargs = {}
-            auth = instance.data["deadline"]["auth"]
-            if auth:
-                kwargs["auth"] = auth
-            response = requests_get(url, **kwargs)
-        except requests.exceptions.ConnectionError:
-            self.log.error("Deadline is not accessible at "
-                           "{}".format(deadline_url))
-            return {}
-
-        if not response.ok:
-            self.log.error("Submission failed!")
-            self.log.error(response.status_code)
-            self.log.error(response.content)
-            raise RuntimeError(response.text)
-
-        json_content = response.json()
-        if json_content:
-            return json_content.pop()
-        return {}
-
-    def _get_existing_files(self, staging_dir):
-        """Returns set of existing file names from 'staging_dir'"""
-        existing_files = set()
-        for file_name in os.listdir(staging_dir):
-            existing_files.add(file_name)
-        return existing_files
+        kwargs = {}
+        auth = instance.data["deadline"]["auth"]
+        if auth:
+            kwargs["auth"] = auth
+
+        job_ids = list(dict.fromkeys(job_ids))
+        end_time = time.monotonic() + self.job_info_timeout
+        jobs_info = {}
+        for idx in range(0, len(job_ids), self.job_info_batch_size):
+            batch_ids = job_ids[idx:idx + self.job_info_batch_size]
+            url = "{}/api/jobs?JobID={}".format(
+                deadline_url, ",".join(batch_ids))
+            response = self._get_within_timeout(
+                url, deadline_url, end_time, **kwargs)
+
+            if not response.ok:
+                self.log.error(response.status_code)
+                self.log.error(response.content)
+                raise PublishValidationError(
+                    "Querying jobs from Deadline failed: {}".format(
+                        response.text)
+                )
+
+            for job_info in response.json() or []:
+                jobs_info[job_info["_id"]] = job_info
+
+        return jobs_info
+
+    def _get_within_timeout(self, url, deadline_url, end_time, **kwargs):
+        """GET request retried only while time for querying jobs remains.
+
+        Retries of the shared session would not respect remaining time,
+        they are done here instead.
+
+        Args:
+            url (str): Requested url.
+            deadline_url (str): Deadline Webservice url.
+            end_time (float): Monotonic time when querying must end.
+
+        Returns:
+            requests.Response: Response which should not be retried.
+
+        Raises:
+            PublishValidationError: Deadline is not accessible or time for
+                querying jobs was exceeded.
+
+        """
+        timeout_message = (
+            "Querying jobs from Deadline exceeded {} seconds.".format(
+                self.job_info_timeout)
+        )
+        attempt = 0
+        while True:
+            timeout = end_time - time.monotonic()
+            if timeout <= 0:
+                raise PublishValidationError(timeout_message)
+
+            try:
+                response = requests_get(
+                    url, timeout=timeout, max_retries=0, **kwargs)
+            except requests.exceptions.Timeout:
+                raise PublishValidationError(timeout_message)
+            except requests.exceptions.ConnectionError:
+                message = "Deadline is not accessible at {}".format(
+                    deadline_url)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                message = "Deadline responded with {}: {}".format(
+                    response.status_code, response.text)
+
+            delay = DEFAULT_BACKOFF_FACTOR * (2 ** attempt)
+            if (
+                attempt >= DEFAULT_MAX_RETRIES
+                or time.monotonic() + delay >= end_time
+            ):
+                raise PublishValidationError(message)
+            self.log.warning("{}, retrying.".format(message))
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_existing_files(self, instance, staging_dir):
+        """Returns set of existing file names from 'staging_dir'
+
+        Directory is listed only once for the publish, representations
+        usually share the staging directory.
+        """
+        directory_index = get_directory_index(instance.context)
+        return directory_index.get_filenames(staging_dir)
+
+    def _get_empty_files(self, instance, staging_dir, filenames):
+        """Returns empty files and warns about possibly truncated files.
+
+        Files much smaller than the median size of the files are only
+        reported, e.g. black frames can be legitimately small.
+
+        Args:
+            instance (pyblish.api.Instance): pyblish instance
+            staging_dir (str): Directory of the files.
+            filenames (Iterable[str]): Existing files to check.
+
+        Returns:
+            set[str]: Names of empty files.
+
+        """
+        directory_index = get_directory_index(instance.context)
+        sizes = {
+            filename: directory_index.stat(staging_dir, filename).st_size
+            for filename in filenames
+        }
+        empty_files = {
+            filename
+            for filename, size in sizes.items()
+            if size == 0
+        }
+        if empty_files:
+            self.log.warning(
+                "Empty files are considered missing: {}".format(
+                    len(empty_files)))
+
+        non_empty_sizes = [size for size in sizes.values() if size]
+        if non_empty_sizes:
+            min_size = (
+                statistics.median(non_empty_sizes) * self.truncated_size_ratio
+            )
+            truncated_files = sorted(
+                filename
+                for filename, size in sizes.items()
+                if 0 < size < min_size
+            )
+            if truncated_files:
+                self.log.warning(
+                    "Files are much smaller than other files and might be"
+                    " truncated: {}".format(", ".join(truncated_files))
+                )
+        return empty_files
 
     def _get_expected_files(self, repre):
         """Returns set of file names in representation['files']
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Wait for asynchronous Deadline submissions to finish."""
+import pyblish.api
+
+from ayon_core.pipeline.publish import KnownPublishError
+
+
+class WaitForDeadlineSubmissions(pyblish.api.ContextPlugin):
+    """Wait until all spooled payloads are submitted to Deadline.
+
+    Jobs are posted to Deadline in background when asynchronous submission
+    is enabled in Settings. Plugins which need job id wait for it, this
+    makes sure failed submissions of all other jobs are reported too.
+    """
+
+    order = pyblish.api.IntegratorOrder + 0.45
+    label = "Wait for Deadline submissions"
+    targets = ["local"]
+
+    def process(self, context):
+        futures = context.data.get("deadlineSubmissionFutures") or []
+        spooled_ids = list(context.data.get("deadlineSpooledSubmissions", []))
+
+        failed = []
+        for future in futures:
+            exc = future.exception()
+            if exc is not None:
+                failed.append(str(exc))
+            elif future.result().get("spooled"):
+                spooled_ids.append(future.placeholder_id)
+
+        if spooled_ids:
+            self.log.warning(
+                "Deadline Webservice was unavailable, {} job(s) were spooled."
+                " Submit them later with 'ayon addon deadline"
+                " replay-submissions'.".format(len(spooled_ids))
+            )
+
+        if failed:
+            raise KnownPublishError(
+                "Failed to submit {} job(s) to Deadline:\n{}".format(
+                    len(failed), "\n".join(failed))
+            )
+        if futures:
+            self.log.debug(
+                "Submitted {} job(s) to Deadline.".format(len(futures)))
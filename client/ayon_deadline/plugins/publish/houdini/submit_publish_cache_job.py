@@ -18,7 +18,10 @@ from ayon_core.pipeline.farm.pyblish_functions import (
     prepare_cache_representations,
     create_metadata_path
 )
-from ayon_deadline.abstract_submit_deadline import requests_post
+from ayon_deadline.submission_queue import (
+    post_or_spool,
+    resolve_submission_job,
+)
 
 
 class ProcessSubmittedCacheJobOnFarm(pyblish.api.InstancePlugin,
@@ -201,15 +204,22 @@ class ProcessSubmittedCacheJobOnFarm(pyblish.api.InstancePlugin,
 
         self.log.debug("Submitting Deadline publish job ...")
 
-        url = "{}/api/jobs".format(self.deadline_url)
         auth = instance.data["deadline"]["auth"]
         verify = instance.data["deadline"]["verify"]
-        response = requests_post(
-            url, json=payload, timeout=10, auth=auth, verify=verify)
-        if not response.ok:
-            raise Exception(response.text)
+        project_settings = instance.context.data["project_settings"]
+        result = post_or_spool(
+            self.deadline_url,
+            payload,
+            auth,
+            verify,
+            spool_on_failure=project_settings["deadline"].get(
+                "spool_failed_submissions", False)
+        )
+        if result.get("spooled"):
+            instance.context.data.setdefault(
+                "deadlineSpooledSubmissions", []).append(result["_id"])
 
-        deadline_publish_job_id = response.json()["_id"]
+        deadline_publish_job_id = result["_id"]
 
         return deadline_publish_job_id
 
@@ -310,7 +320,8 @@ class ProcessSubmittedCacheJobOnFarm(pyblish.api.InstancePlugin,
         render_job = None
         submission_type = ""
         if instance.data.get("toBeRenderedOn") == "deadline":
-            render_job = instance.data.pop("deadlineSubmissionJob", None)
+            render_job = resolve_submission_job(
+                instance.data.pop("deadlineSubmissionJob", None))
             submission_type = "deadline"
 
         if not render_job:
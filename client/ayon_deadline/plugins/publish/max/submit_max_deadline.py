@@ -96,12 +96,14 @@ class MaxSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
             payload = self._use_published_name_for_multiples(
                 payload_data, project_settings)
             job_infos, plugin_infos = payload
-            for job_info, plugin_info in zip(job_infos, plugin_infos):
-                self.submit(
-                    self.assemble_payload(job_info, plugin_info),
-                    auth=auth,
-                    verify=verify
-                )
+            self.submit_many(
+                [
+                    self.assemble_payload(job_info, plugin_info)
+                    for job_info, plugin_info in zip(job_infos, plugin_infos)
+                ],
+                auth=auth,
+                verify=verify
+            )
         else:
             payload = self._use_published_name(payload_data, project_settings)
             job_info, plugin_info = payload
@@ -120,7 +122,7 @@ class MaxSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
         from ayon_max.api.lib_rendersettings import RenderSettings
 
         instance = self._instance
-        job_info = copy.deepcopy(self.job_info)
+        job_info = self.job_info.copy()
         plugin_info = copy.deepcopy(self.plugin_info)
         plugin_data = {}
 
@@ -184,7 +186,7 @@ class MaxSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
         """
         instance = self._instance
         context = instance.context
-        job_info = copy.deepcopy(self.job_info)
+        job_info = self.job_info.copy()
         exp = instance.data.get("expectedFiles")
 
         src_filepath = context.data["currentFile"]
@@ -29,6 +29,7 @@ from dataclasses import dataclass, field, asdict
 from ayon_core.pipeline import (
     AYONPyblishPluginMixin
 )
+from ayon_core.pipeline.publish import KnownPublishError
 
 from ayon_core.lib import is_in_tests
 from ayon_core.pipeline.farm.tools import iter_expected_files
@@ -233,7 +234,7 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
         instance = self._instance
 
         payload_job_info, payload_plugin_info = payload
-        job_info = copy.deepcopy(payload_job_info)
+        job_info = payload_job_info.copy()
         plugin_info = copy.deepcopy(payload_plugin_info)
 
         # Force plugin reload for vray cause the region does not get flushed
@@ -280,12 +281,19 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
 
         # Define frame tile jobs
         frame_file_hash = {}
-        frame_payloads = {}
+        frame_payloads = []
+        # index of the frame tile job payload in submitted payloads
+        frame_payload_index = {}
         file_index = 1
         for file in files:
             frame = re.search(R_FRAME_NUMBER, file).group("frame")
+            if frame in frame_payload_index:
+                raise KnownPublishError(
+                    "Multiple tile render files of frame {}, each frame"
+                    " must have one tile job.".format(frame)
+                )
 
-            new_job_info = copy.deepcopy(job_info)
+            new_job_info = job_info.copy()
             new_job_info.Name += " (Frame {} - {} tiles)".format(frame,
                                                                  tiles_count)
             new_job_info.TileJobFrame = frame
@@ -315,24 +323,15 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
             new_job_info.ExtraInfo[0] = file_hash
             new_job_info.ExtraInfo[1] = file
 
-            frame_payloads[frame] = self.assemble_payload(
+            frame_payload_index[frame] = len(frame_payloads)
+            frame_payloads.append(self.assemble_payload(
                 job_info=new_job_info,
                 plugin_info=new_plugin_info
-            )
+            ))
             file_index += 1
 
-        self.log.debug(
-            "Submitting tile job(s) [{}] ...".format(len(frame_payloads)))
-
-        # Submit frame tile jobs
-        frame_tile_job_id = {}
-        for frame, tile_job_payload in frame_payloads.items():
-            job_id = self.submit(
-                tile_job_payload, auth, verify)
-            frame_tile_job_id[frame] = job_id
-
         # Define assembly payloads
-        assembly_job_info = copy.deepcopy(job_info)
+        assembly_job_info = job_info.copy()
         assembly_job_info.Plugin = self.tile_assembler_plugin
         assembly_job_info.Name += " - Tile Assembly Job"
         assembly_job_info.Frames = 1
@@ -342,6 +341,8 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
         assembly_job_info.Priority = attr_values.get("tile_priority",
                                                      self.tile_priority)
         assembly_job_info.TileJob = False
+        # tile job of the frame is set as dependency on submission
+        assembly_job_info.JobDependencies = None
 
         assembly_job_info.Pool = self.job_info.Pool
 
@@ -352,23 +353,27 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
         }
 
         assembly_payloads = []
+        assembly_dependencies = []
         output_dir = self.job_info.OutputDirectory[0]
         config_files = []
         for file in assembly_files:
             frame = re.search(R_FRAME_NUMBER, file).group("frame")
+            if frame not in frame_payload_index:
+                raise KnownPublishError(
+                    "Frame {} of assembled file has no tile job.".format(
+                        frame)
+                )
 
-            frame_assembly_job_info = copy.deepcopy(assembly_job_info)
+            frame_assembly_job_info = assembly_job_info.copy()
             frame_assembly_job_info.Name += " (Frame {})".format(frame)
             frame_assembly_job_info.OutputFilename[0] = re.sub(
                 REPL_FRAME_NUMBER,
                 "\\1{}\\3".format("#" * len(frame)), file)
 
             file_hash = frame_file_hash[frame]
-            tile_job_id = frame_tile_job_id[frame]
 
             frame_assembly_job_info.ExtraInfo[0] = file_hash
             frame_assembly_job_info.ExtraInfo[1] = file
-            frame_assembly_job_info.JobDependencies = tile_job_id
             frame_assembly_job_info.Frames = frame
 
             # write assembly job config files
@@ -424,23 +429,27 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
                     aux_files=[config_file]
                 )
             )
+            # Assembly job depends on tile job of the same frame
+            assembly_dependencies.append(frame_payload_index[frame])
 
-        # Submit assembly jobs
-        assembly_job_ids = []
-        num_assemblies = len(assembly_payloads)
-        for i, payload in enumerate(assembly_payloads):
-            self.log.debug(
-                "submitting assembly job {} of {}".format(i + 1,
-                                                          num_assemblies)
-            )
-            assembly_job_id = self.submit(
-                payload,
-                auth=auth,
-                verify=verify
-            )
-            assembly_job_ids.append(assembly_job_id)
+        # Submit frame tile jobs and assembly jobs depending on them
+        self.log.debug(
+            "Submitting tile job(s) [{}] and assembly job(s) [{}] ...".format(
+                len(frame_payloads), len(assembly_payloads)))
+        payloads = frame_payloads + assembly_payloads
+        tile_jobs_count = len(frame_payloads)
+        dependencies = {
+            tile_jobs_count + index: [tile_payload_index]
+            for index, tile_payload_index in enumerate(assembly_dependencies)
+        }
+        job_ids = self.submit_many(
+            payloads,
+            auth=auth,
+            verify=verify,
+            dependencies=dependencies
+        )
 
-        instance.data["assemblySubmissionJobs"] = assembly_job_ids
+        instance.data["assemblySubmissionJobs"] = job_ids[tile_jobs_count:]
 
         # Remove config files to avoid confusion about where data is coming
         # from in Deadline.
@@ -449,7 +458,7 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
 
     def _get_maya_payload(self, data):
 
-        job_info = copy.deepcopy(self.job_info)
+        job_info = self.job_info.copy()
 
         if not is_in_tests() and self.job_info.UseAssetDependencies:
             # Asset dependency to wait for at least the scene file to sync.
@@ -494,7 +503,7 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
 
     def _get_vray_export_payload(self, data):
 
-        job_info = copy.deepcopy(self.job_info)
+        job_info = self.job_info.copy()
         job_info.Name = self._job_info_label("Export")
 
         # Get V-Ray settings info to compute output path
@@ -512,11 +521,16 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
     def _get_vray_render_payload(self, data):
 
         # Job Info
-        job_info = copy.deepcopy(self.job_info)
+        job_info = self.job_info.copy()
         job_info.Name = self._job_info_label("Render")
         job_info.Plugin = "Vray"
         job_info.OverrideTaskExtraInfoNames = False
 
+        # Job outputs are registered with frame token, V-Ray expects
+        #   concrete file name of the first expected file
+        first_file = next(
+            iter_expected_files(self._instance.data["expectedFiles"]))
+
         # Plugin Info
         plugin_info = VRayPluginInfo(
             InputFilename=self.format_vray_output_filename(),
@@ -524,15 +538,15 @@ class MayaSubmitDeadline(abstract_submit_deadline.AbstractSubmitDeadline,
             VRayEngine="V-Ray",
             Width=self._instance.data["resolutionWidth"],
             Height=self._instance.data["resolutionHeight"],
-            OutputFilePath=job_info.OutputDirectory[0],
-            OutputFileName=job_info.OutputFilename[0]
+            OutputFilePath=os.path.dirname(first_file),
+            OutputFileName=os.path.basename(first_file)
         )
 
         return job_info, asdict(plugin_info)
 
     def _get_arnold_render_payload(self, data):
         # Job Info
-        job_info = copy.deepcopy(self.job_info)
+        job_info = self.job_info.copy()
         job_info.Name = self._job_info_label("Render")
         job_info.Plugin = "Arnold"
         job_info.OverrideTaskExtraInfoNames = False
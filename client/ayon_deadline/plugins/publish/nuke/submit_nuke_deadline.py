@@ -9,6 +9,8 @@ from ayon_core.pipeline.publish import (
     AYONPyblishPluginMixin
 )
 from ayon_deadline import abstract_submit_deadline
+from ayon_deadline.lib import FileSequence
+from ayon_deadline.submission_queue import resolve_submission_job
 
 
 @dataclass
@@ -91,10 +93,12 @@ class NukeSubmitDeadline(
             instance.data["publishJobState"] = "Suspended"
 
         if instance.data.get("bakingNukeScripts"):
+            baking_payloads = []
             for baking_script in instance.data["bakingNukeScripts"]:
                 self.job_info.JobType = "Normal"
 
-                response_data = instance.data["deadlineSubmissionJob"]
+                response_data = resolve_submission_job(
+                    instance.data["deadlineSubmissionJob"])
                 if response_data.get("_id"):
                     self.job_info.BatchName = response_data["Props"]["Batch"]
                     self.job_info.JobDependency0 = response_data["_id"]
@@ -108,15 +112,22 @@ class NukeSubmitDeadline(
                     render_path=render_path,
                     write_node_name=write_node_name
                 )
-                job_id = self.process_submission()
+                baking_payloads.append(self.assemble_payload())
+
+            job_ids = self.submit_many(
+                baking_payloads,
+                auth=instance.data["deadline"]["auth"],
+                verify=instance.data["deadline"]["verify"]
+            )
+            for job_id in job_ids:
                 self.log.info(
                     "Submitted baking job to Deadline: {}.".format(job_id))
 
-                # add to list of job Id
-                if not instance.data.get("bakingSubmissionJobs"):
-                    instance.data["bakingSubmissionJobs"] = []
+            # add to list of job Id
+            if not instance.data.get("bakingSubmissionJobs"):
+                instance.data["bakingSubmissionJobs"] = []
 
-                instance.data["bakingSubmissionJobs"].append(job_id)
+            instance.data["bakingSubmissionJobs"].extend(job_ids)
 
     def get_job_info(self, job_info=None, **kwargs):
         instance = self._instance
@@ -228,15 +239,8 @@ class NukeSubmitDeadline(
                     "Skipping expected file: {}".format(filepath))
                 return
 
-        # in case path is hashed sequence expression
-        # (e.g. /path/to/file.####.png)
-        if "#" in file:
-            pparts = file.split("#")
-            padding = "%0{}d".format(len(pparts) - 1)
-            file = pparts[0] + padding + pparts[-1]
-
         # in case input path was single file (video or image)
-        if "%" not in file:
+        if "#" not in file and "%" not in file:
             instance.data["expectedFiles"].append(filepath)
             return
 
@@ -245,6 +249,11 @@ class NukeSubmitDeadline(
             start_frame -= 1
 
         # add sequence files to expected files
-        for i in range(start_frame, (end_frame + 1)):
-            instance.data["expectedFiles"].append(
-                os.path.join(dirname, (file % i)).replace("\\", "/"))
+        # (path can be hashed sequence expression, e.g. /path/to/file.####.png)
+        sequence = FileSequence(
+            os.path.join(dirname, file), range(start_frame, end_frame + 1))
+        instance.data["expectedFiles"].extend(sequence)
+        # Job outputs are registered from the sequence, not guessed from
+        #   expected files
+        instance.data.setdefault("expectedFileSequences", []).append(
+            sequence)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""Long-lived AYON process publishing farm jobs on a Deadline worker.
+
+Starting AYON for each publish task means interpreter start, addon
+discovery and settings fetch every time. The daemon does that once and
+then accepts publish requests from the `Ayon` Deadline plug-in over
+a local socket. Each request is published in a forked process, so
+requests don't share state with each other, and its output is streamed
+back to the plug-in.
+
+Protocol uses JSON lines. Request:
+    {"token": "...", "metadata_path": "...", "targets": [...],
+     "environment": {...}}
+
+Responses:
+    {"type": "output", "text": "..."}
+    {"type": "result", "returncode": 0}
+    {"type": "error", "message": "..."}
+
+Daemon writes its port and token to state file, which is readable only by
+the user running it, and exits when it doesn't receive any request for
+idle timeout.
+
+Requires `os.fork`, so it is available on Linux and macOS workers only.
+
+"""
+import os
+import sys
+import json
+import socket
+import secrets
+import tempfile
+import traceback
+
+DEFAULT_IDLE_TIMEOUT = 600
+
+# Addons discovered on daemon start, reused by forked publish processes
+_addons_manager = None
+
+
+def is_publish_daemon_supported():
+    return hasattr(os, "fork")
+
+
+def run_publish_daemon(state_file, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Run publish daemon until it is idle for `idle_timeout` seconds.
+
+    Args:
+        state_file (str): Path where port and token of daemon are stored.
+        idle_timeout (int): Seconds without request after which daemon
+            exits.
+
+    """
+    if not is_publish_daemon_supported():
+        raise RuntimeError(
+            "Publish daemon is not supported on this platform."
+        )
+
+    _warm_up()
+
+    server = socket.create_server(("127.0.0.1", 0))
+    server.settimeout(idle_timeout)
+    token = secrets.token_hex(32)
+    _write_state_file(state_file, {
+        "pid": os.getpid(),
+        "port": server.getsockname()[1],
+        "token": token,
+    })
+    print("Publish daemon listening on port {}".format(
+        server.getsockname()[1]))
+    sys.stdout.flush()
+
+    try:
+        while True:
+            _reap_children()
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                print("Publish daemon is idle, exiting.")
+                break
+
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                returncode = 0
+                try:
+                    _handle_connection(conn, token)
+                except Exception:
+                    traceback.print_exc()
+                    returncode = 1
+                finally:
+                    os._exit(returncode)
+            conn.close()
+    finally:
+        server.close()
+        _remove_state_file(state_file)
+
+
+def _warm_up():
+    """Import and discover everything publishing needs upfront."""
+    global _addons_manager
+
+    import ayon_api
+    import pyblish.api  # noqa: F401
+    import pyblish.util  # noqa: F401
+    from ayon_core.addon import AddonsManager
+    from ayon_core.pipeline.publish import main_cli_publish  # noqa: F401
+
+    _addons_manager = AddonsManager()
+    # Forked processes must not share connections to the server
+    ayon_api.close_connection()
+
+
+def _handle_connection(conn, token):
+    reader = conn.makefile("r", encoding="utf-8")
+    writer = conn.makefile("w", encoding="utf-8")
+    request = json.loads(reader.readline() or "{}")
+    if not secrets.compare_digest(str(request.get("token", "")), token):
+        _send(writer, {"type": "error", "message": "Invalid token."})
+        return
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        conn.close()
+        os.dup2(write_fd, 1)
+        os.dup2(write_fd, 2)
+        os.close(write_fd)
+        os._exit(_publish(request))
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "r", encoding="utf-8", errors="replace") as out:
+        for line in out:
+            _send(writer, {"type": "output", "text": line.rstrip("\n")})
+
+    _, status = os.waitpid(pid, 0)
+    _send(writer, {
+        "type": "result",
+        "returncode": os.waitstatus_to_exitcode(status),
+    })
+
+
+def _publish(request):
+    """Publish metadata from request, runs in forked process.
+
+    Returns:
+        int: Exit code.
+
+    """
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+    os.environ.update(request.get("environment") or {})
+    try:
+        from ayon_core.pipeline.publish import main_cli_publish
+
+        main_cli_publish(
+            request["metadata_path"],
+            request.get("targets") or None,
+            _addons_manager
+        )
+    except SystemExit as exc:
+        if exc.code is None:
+            return 0
+        return exc.code if isinstance(exc.code, int) else 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return 0
+
+
+def _send(writer, message):
+    writer.write(json.dumps(message) + "\n")
+    writer.flush()
+
+
+def _reap_children():
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _write_state_file(path, data):
+    dirpath = os.path.dirname(path)
+    os.makedirs(dirpath, exist_ok=True)
+    # 'mkstemp' creates file readable only by current user
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=dirpath)
+    with os.fdopen(fd, "w") as stream:
+        json.dump(data, stream)
+    os.replace(tmp_path, path)
+
+
+def _remove_state_file(path):
+    try:
+        with open(path, "r") as stream:
+            data = json.load(stream)
+        # Don't remove state of daemon which replaced this one
+        if data.get("pid") == os.getpid():
+            os.remove(path)
+    except (OSError, ValueError):
+        pass
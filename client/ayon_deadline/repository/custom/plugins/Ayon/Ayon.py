@@ -12,9 +12,24 @@ from Deadline.Scripting import (
 
 import re
 import os
+import json
+import time
+import shlex
+import socket
+import hashlib
+import tempfile
 import platform
+import subprocess
 
-__version__ = "1.0.0"
+__version__ = "1.1.1"
+
+PROGRESS_REGEX = re.compile(".*Progress: (\\d+)%.*")
+# Seconds to wait for publish daemon to start
+DAEMON_START_TIMEOUT = 300
+
+
+class PublishDaemonUnavailable(Exception):
+    """Publish daemon could not be started or connected to."""
 
 ######################################################################
 # This is the function that Deadline calls to get an instance of the
@@ -42,6 +57,7 @@ class AyonDeadlinePlugin(DeadlinePlugin):
         self.InitializeProcessCallback += self.InitializeProcess
         self.RenderExecutableCallback += self.RenderExecutable
         self.RenderArgumentCallback += self.RenderArgument
+        self.RenderTasksCallback += self.RenderTasks
 
     def Cleanup(self):
         for stdoutHandler in self.StdoutHandlers:
@@ -50,12 +66,18 @@ class AyonDeadlinePlugin(DeadlinePlugin):
         del self.InitializeProcessCallback
         del self.RenderExecutableCallback
         del self.RenderArgumentCallback
+        del self.RenderTasksCallback
 
     def InitializeProcess(self):
         self.LogInfo(
             "Initializing process with AYON plugin {}".format(__version__)
         )
-        self.PluginType = PluginType.Simple
+        self.UsePublishDaemon = self._use_publish_daemon()
+        if self.UsePublishDaemon:
+            self.LogInfo("Publishing with AYON publish daemon")
+            self.PluginType = PluginType.Advanced
+        else:
+            self.PluginType = PluginType.Simple
         self.StdoutHandling = True
 
         self.SingleFramesOnly = self.GetBooleanPluginInfoEntryWithDefault(
@@ -157,3 +179,247 @@ class AyonDeadlinePlugin(DeadlinePlugin):
     def HandleProgress(self):
         progress = float(self.GetRegexMatch(1))
         self.SetProgress(progress)
+
+    def RenderTasks(self):
+        """Publish with publish daemon, used only in daemon mode."""
+        exe = self.RenderExecutable()
+        arguments = self.RenderArgument()
+        try:
+            returncode = self._publish_with_daemon(exe, arguments)
+        except PublishDaemonUnavailable as exc:
+            self.LogWarning(
+                "Publish daemon is not available, running AYON process"
+                " instead. {}".format(exc)
+            )
+            returncode = self.RunProcess(
+                exe, arguments, os.path.dirname(exe), -1)
+
+        if returncode != 0:
+            self.FailRender(
+                "AYON publish failed with exit code {}".format(returncode))
+
+    def _use_publish_daemon(self):
+        if not self.GetBooleanConfigEntryWithDefault(
+                "AyonPublishDaemon", False):
+            return False
+
+        if platform.system().lower() == "windows":
+            self.LogInfo("AYON publish daemon is not supported on Windows")
+            return False
+
+        arguments = self.GetPluginInfoEntryWithDefault("Arguments", "")
+        return _parse_publish_arguments(arguments) is not None
+
+    def _publish_with_daemon(self, exe, arguments):
+        """Send publish request to daemon and stream its output.
+
+        Daemon is started if is not running. Raises
+        'PublishDaemonUnavailable' only before request was sent, so it is
+        safe to fall back to regular AYON process.
+
+        Returns:
+            int: Exit code of publish.
+
+        """
+        metadata_path, targets, use_staging = _parse_publish_arguments(
+            arguments)
+        environment = self._get_daemon_environment()
+        state_path = self._get_daemon_state_path(exe, environment)
+
+        try:
+            state, sock = self._connect_daemon(state_path)
+        except (OSError, ValueError, KeyError):
+            try:
+                self._start_daemon(
+                    exe, state_path, environment, use_staging)
+            except OSError as exc:
+                # e.g. state directory is not writable
+                raise PublishDaemonUnavailable(str(exc))
+            try:
+                state, sock = self._connect_daemon(state_path)
+            except (OSError, ValueError, KeyError) as exc:
+                raise PublishDaemonUnavailable(str(exc))
+
+        request = {
+            "token": state["token"],
+            "metadata_path": metadata_path,
+            "targets": targets,
+            "environment": self._get_publish_environment(environment),
+        }
+        returncode = None
+        with sock, \
+                sock.makefile("r", encoding="utf-8") as reader, \
+                sock.makefile("w", encoding="utf-8") as writer:
+            writer.write(json.dumps(request) + "\n")
+            writer.flush()
+            for line in reader:
+                message = json.loads(line)
+                if message["type"] == "output":
+                    self._handle_daemon_output(message["text"])
+                elif message["type"] == "result":
+                    returncode = message["returncode"]
+                    break
+                elif message["type"] == "error":
+                    self.FailRender(
+                        "Publish daemon error: {}".format(message["message"])
+                    )
+
+        if returncode is None:
+            self.FailRender("Publish daemon closed connection unexpectedly")
+        return returncode
+
+    def _handle_daemon_output(self, text):
+        self.LogInfo(text)
+        match = PROGRESS_REGEX.match(text)
+        if match:
+            self.SetProgress(float(match.group(1)))
+
+    def _get_daemon_environment(self):
+        """Environment which defines AYON process of the daemon."""
+        job = self.GetJob()
+        config = RepositoryUtils.GetPluginConfig("Ayon")
+        environment = {
+            "AYON_SERVER_URL": (
+                job.GetJobEnvironmentKeyValue("AYON_SERVER_URL")
+                or config.GetConfigEntryWithDefault("AyonServerUrl", "")
+            ),
+            "AYON_API_KEY": (
+                job.GetJobEnvironmentKeyValue("AYON_API_KEY")
+                or config.GetConfigEntryWithDefault("AyonApiKey", "")
+            ),
+            "AYON_BUNDLE_NAME": job.GetJobEnvironmentKeyValue(
+                "AYON_BUNDLE_NAME"),
+        }
+        settings_variant = job.GetJobEnvironmentKeyValue(
+            "AYON_DEFAULT_SETTINGS_VARIANT")
+        if settings_variant:
+            environment["AYON_DEFAULT_SETTINGS_VARIANT"] = settings_variant
+        return environment
+
+    def _get_publish_environment(self, environment):
+        """Environment of single publish, as regular process would have."""
+        job = self.GetJob()
+        publish_env = {
+            key: job.GetJobEnvironmentKeyValue(key)
+            for key in job.GetJobEnvironmentKeys()
+        }
+        publish_env.update(environment)
+        for key in ("RENDER_JOB_IDS", "AYON_PUBLISH_JOB_ID"):
+            value = self.GetProcessEnvironmentVariable(key)
+            if value:
+                publish_env[key] = value
+        return publish_env
+
+    def _get_daemon_state_path(self, exe, environment):
+        """Daemon is shared by tasks with the same executable and bundle."""
+        key_data = json.dumps(
+            [os.path.realpath(exe), sorted(environment.items())])
+        key = hashlib.sha1(key_data.encode("utf-8")).hexdigest()
+        return os.path.join(
+            tempfile.gettempdir(),
+            "ayon_deadline",
+            "publish_daemon",
+            "{}.json".format(key)
+        )
+
+    def _connect_daemon(self, state_path):
+        with open(state_path, "r") as stream:
+            state = json.load(stream)
+        sock = socket.create_connection(("127.0.0.1", state["port"]), 10)
+        sock.settimeout(None)
+        return state, sock
+
+    def _start_daemon(self, exe, state_path, environment, use_staging):
+        """Start daemon and wait until it is ready.
+
+        Tasks starting at the same time on the worker wait for daemon
+        started by the first of them.
+        """
+        lock_path = state_path + ".lock"
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            owns_lock = True
+        except FileExistsError:
+            owns_lock = False
+            # Lock of daemon which failed to start
+            if time.time() - os.path.getmtime(lock_path) > (
+                    DAEMON_START_TIMEOUT):
+                os.remove(lock_path)
+                return self._start_daemon(
+                    exe, state_path, environment, use_staging)
+
+        try:
+            if owns_lock:
+                if os.path.exists(state_path):
+                    os.remove(state_path)
+                idle_timeout = self.GetIntegerConfigEntryWithDefault(
+                    "AyonPublishDaemonIdleTimeout", 600)
+                args = [
+                    exe, "--headless", "addon", "deadline", "publish-daemon",
+                    "--state-file", state_path,
+                    "--idle-timeout", str(idle_timeout),
+                ]
+                if use_staging:
+                    args.append("--use-staging")
+
+                env = dict(os.environ)
+                env.update(environment)
+                self.LogInfo("Starting AYON publish daemon: {}".format(
+                    subprocess.list2cmdline(args)))
+                log_path = os.path.splitext(state_path)[0] + ".log"
+                try:
+                    with open(log_path, "ab") as log_stream:
+                        subprocess.Popen(
+                            args,
+                            env=env,
+                            cwd=os.path.dirname(exe),
+                            stdin=subprocess.DEVNULL,
+                            stdout=log_stream,
+                            stderr=subprocess.STDOUT,
+                            # Daemon outlives the task
+                            start_new_session=True,
+                            close_fds=True,
+                        )
+                except OSError as exc:
+                    raise PublishDaemonUnavailable(
+                        "Failed to start publish daemon: {}".format(exc))
+
+            start = time.time()
+            while not os.path.exists(state_path):
+                if time.time() - start > DAEMON_START_TIMEOUT:
+                    raise PublishDaemonUnavailable(
+                        "Publish daemon did not start in {} seconds".format(
+                            DAEMON_START_TIMEOUT)
+                    )
+                time.sleep(0.5)
+        finally:
+            if owns_lock:
+                os.remove(lock_path)
+
+
+def _parse_publish_arguments(arguments):
+    """Parse metadata path and targets from publish arguments.
+
+    Returns:
+        Union[tuple[str, list[str], bool], None]: Metadata path, targets and
+            if staging variant is used. None if arguments are not publish.
+
+    """
+    args = [
+        arg.strip('"')
+        for arg in shlex.split(str(arguments), posix=False)
+    ]
+    if "publish" not in args:
+        return None
+    index = args.index("publish")
+    if index + 1 >= len(args):
+        return None
+
+    metadata_path = args[index + 1]
+    targets = [
+        value
+        for arg, value in zip(args, args[1:])
+        if arg in ("-t", "--targets")
+    ]
+    return metadata_path, targets, "--use-staging" in args
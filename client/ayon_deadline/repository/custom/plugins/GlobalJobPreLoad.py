@@ -1,7 +1,10 @@
 # /usr/bin/env python3
 # -*- coding: utf-8 -*-
 import os
+import time
+import hashlib
 import tempfile
+import contextlib
 from datetime import datetime
 import subprocess
 import json
@@ -13,7 +16,7 @@ from Deadline.Scripting import (
     FileUtils,
     DirectoryUtils,
 )
-__version__ = "1.2.0"
+__version__ = "1.6.1"
 VERSION_REGEX = re.compile(
     r"(?P<major>0|[1-9]\d*)"
     r"\.(?P<minor>0|[1-9]\d*)"
@@ -450,6 +453,314 @@ def get_ayon_api_key_from_additional_servers(config, server):
             return api_key
 
 
+def get_environment_cache_dir():
+    """Directory where extracted environments are cached on the worker."""
+    return os.path.join(
+        tempfile.gettempdir(), "ayon_deadline", "environments")
+
+
+def get_environment_cache_key(*values):
+    """Cache key of extracted environment.
+
+    Args:
+        *values (str): Values which define the environment, e.g. bundle
+            name, settings variant, project, folder, task, app and server.
+
+    Returns:
+        str: Hash usable as filename.
+
+    """
+    data = json.dumps([value or "" for value in values])
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def get_environment_cache_ttl(config):
+    """Seconds for which extracted environments are cached, 0 disables."""
+    ttl = config.GetConfigEntryWithDefault("AyonEnvironmentCacheTTL", "3600")
+    try:
+        return int(ttl)
+    except (TypeError, ValueError):
+        return 0
+
+
+def load_cached_environment(cache_key, ttl):
+    """Load environment extracted by previous task on this worker.
+
+    Args:
+        cache_key (str): Cache key of environment.
+        ttl (int): Seconds for which cached environment is valid.
+
+    Returns:
+        Union[dict[str, str], None]: Environment or None if not cached or
+            expired.
+
+    """
+    if ttl <= 0:
+        return None
+    path = os.path.join(
+        get_environment_cache_dir(), "{}.json".format(cache_key))
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "r") as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_environment(cache_key, environment):
+    """Store extracted environment for following tasks on this worker."""
+    path = os.path.join(
+        get_environment_cache_dir(), "{}.json".format(cache_key))
+    try:
+        write_json_atomic(path, environment)
+    except OSError as exc:
+        print(">>> Failed to cache environment: {}".format(exc))
+
+
+def write_json_atomic(path, data):
+    """Write json file so concurrent readers never see it partially written.
+
+    Data are written to temporary file, which is created readable only by
+    current user as environments contain secrets, and moved to the path.
+    """
+    dirpath = os.path.dirname(path)
+    os.makedirs(dirpath, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=dirpath)
+    try:
+        with os.fdopen(fd, "w") as stream:
+            json.dump(data, stream)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def file_lock(lock_path, timeout=600):
+    """Lock shared by processes using lock file.
+
+    Processes wait for the one holding the lock instead of doing the same
+    work. Lock older than timeout is considered stale. After timeout the
+    process continues without the lock.
+
+    Args:
+        lock_path (str): Path to lock file.
+        timeout (int): Seconds to wait for the lock.
+
+    """
+    acquired = False
+    start = time.time()
+    try:
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        while time.time() - start < timeout:
+            try:
+                os.close(os.open(
+                    lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                acquired = True
+                break
+            except FileExistsError:
+                pass
+
+            try:
+                if time.time() - os.path.getmtime(lock_path) > timeout:
+                    print(">>> Removing stale lock {}".format(lock_path))
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                # Lock was released meanwhile
+                continue
+            time.sleep(1)
+    except OSError as exc:
+        print(">>> Failed to lock {}: {}".format(lock_path, exc))
+
+    try:
+        yield
+    finally:
+        if acquired:
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+
+
+def get_ayon_environment(
+    deadlinePlugin, exe, cache_key, cache_ttl, add_kwargs, settings_variant
+):
+    """Get environment of the task, extract it only if really needed.
+
+    Environment is loaded from the worker cache, otherwise it is extracted
+    and cached. Tasks starting at the same time on the worker wait for the
+    one which extracts the environment.
+
+    Environment is not shared through the job auxiliary folder, it can
+    contain secrets which would be readable by every user of the repository.
+
+    Nothing is cached when 'cache_ttl' is 0, environment is extracted for
+    every task.
+
+    Returns:
+        dict[str, str]: Environment.
+
+    """
+    if cache_ttl <= 0:
+        return extract_ayon_environment(
+            deadlinePlugin, exe, add_kwargs, settings_variant)
+
+    worker_lock_path = os.path.join(
+        get_environment_cache_dir(), "{}.lock".format(cache_key))
+    with file_lock(worker_lock_path):
+        contents = load_cached_environment(cache_key, cache_ttl)
+        if contents is not None:
+            print(">>> Using environment cached on worker")
+        else:
+            contents = extract_ayon_environment(
+                deadlinePlugin, exe, add_kwargs, settings_variant)
+            store_cached_environment(cache_key, contents)
+    return contents
+
+
+def get_launcher_version_key(exe, bundle_name, server_url):
+    """Key identifying AYON executable, its version and bundle.
+
+    Arguments supported by AYON process depend on addons of the bundle too,
+    not only on the launcher version.
+    """
+    exe = os.path.realpath(exe)
+    stat = os.stat(exe)
+    return get_environment_cache_key(
+        exe, str(stat.st_mtime), str(stat.st_size), bundle_name, server_url)
+
+
+def get_extract_arguments_form(deadlinePlugin, exe):
+    """Which form of arguments the AYON executable supports.
+
+    Result is probed only once per worker, AYON executable version and
+    bundle, so each task runs exactly one extraction process. Failed
+    probes are not cached (e.g. when server was unavailable).
+
+    Returns:
+        str: 'addon' for 'addon applications extractenvironments' or
+            'legacy' for 'extractenvironments'.
+
+    """
+    cache_path = os.path.join(
+        get_environment_cache_dir(), "launcher_arguments.json")
+    try:
+        version_key = get_launcher_version_key(
+            exe,
+            deadlinePlugin.GetProcessEnvironmentVariable("AYON_BUNDLE_NAME"),
+            deadlinePlugin.GetProcessEnvironmentVariable("AYON_SERVER_URL"),
+        )
+    except OSError:
+        version_key = None
+
+    forms_by_version = {}
+    try:
+        with open(cache_path, "r") as stream:
+            forms_by_version = json.load(stream)
+    except (OSError, ValueError):
+        pass
+
+    if version_key in forms_by_version:
+        return forms_by_version[version_key]
+
+    form = None
+    for probe_form, probe_args in (
+        ("addon", ["addon", "applications", "extractenvironments"]),
+        ("legacy", ["extractenvironments"]),
+    ):
+        args_str = subprocess.list2cmdline(
+            ["--headless"] + probe_args + ["--help"])
+        print(">>> Probing AYON arguments: {} {}".format(exe, args_str))
+        exitcode = deadlinePlugin.RunProcess(
+            exe, args_str, os.path.dirname(exe), -1)
+        if exitcode == 0:
+            form = probe_form
+            break
+
+    if form is None:
+        print(">>> Failed to probe AYON arguments, using addon arguments")
+        return "addon"
+
+    if version_key:
+        forms_by_version[version_key] = form
+        try:
+            write_json_atomic(cache_path, forms_by_version)
+        except OSError as exc:
+            print(">>> Failed to cache AYON arguments: {}".format(exc))
+    return form
+
+
+def extract_ayon_environment(
+    deadlinePlugin, exe, add_kwargs, settings_variant
+):
+    """Run AYON process to extract environment.
+
+    Returns:
+        dict[str, str]: Extracted environment.
+
+    """
+    # tempfile.TemporaryFile cannot be used because of locking
+    temp_file_name = "{}_{}.json".format(
+        datetime.utcnow().strftime("%Y%m%d%H%M%S%f"),
+        str(uuid.uuid1())
+    )
+    export_url = os.path.join(tempfile.gettempdir(), temp_file_name)
+    print(">>> Temporary path: {}".format(export_url))
+
+    if get_extract_arguments_form(deadlinePlugin, exe) == "addon":
+        # Use applications addon arguments
+        args = [
+            "--headless",
+            "addon",
+            "applications",
+            "extractenvironments",
+            export_url
+        ]
+
+        # staging requires passing argument
+        # TODO could be switched to env var after https://github.com/ynput/ayon-launcher/issues/123
+        if settings_variant == "staging":
+            args.append("--use-staging")
+
+    else:
+        # Backwards compatibility for older versions
+        args = [
+            "--headless",
+            "extractenvironments",
+            export_url
+        ]
+        # Legacy arguments expect '--asset' instead of '--folder'
+        add_kwargs = {
+            "asset" if key == "folder" else key: value
+            for key, value in add_kwargs.items()
+        }
+
+    for key, value in add_kwargs.items():
+        args.extend(["--{}".format(key), value])
+
+    args_str = subprocess.list2cmdline(args)
+    print(">>> Executing: {} {}".format(exe, args_str))
+    process_exitcode = deadlinePlugin.RunProcess(
+        exe, args_str, os.path.dirname(exe), -1
+    )
+
+    if process_exitcode != 0:
+        raise RuntimeError(
+            "Failed to run AYON process to extract environments."
+        )
+
+    print(">>> Loading file ...")
+    with open(export_url) as fp:
+        contents = json.load(fp)
+
+    print(">>> Removing temporary file")
+    os.remove(export_url)
+    return contents
+
+
 def inject_ayon_environment(deadlinePlugin):
     """ Pull env vars from AYON and push them to rendering process.
 
@@ -516,14 +827,6 @@ def inject_ayon_environment(deadlinePlugin):
                 "AYON_SERVER_URL and AYON_API_KEY"
             ))
 
-        # tempfile.TemporaryFile cannot be used because of locking
-        temp_file_name = "{}_{}.json".format(
-            datetime.utcnow().strftime("%Y%m%d%H%M%S%f"),
-            str(uuid.uuid1())
-        )
-        export_url = os.path.join(tempfile.gettempdir(), temp_file_name)
-        print(">>> Temporary path: {}".format(export_url))
-
         add_kwargs = {
             "envgroup": "farm",
         }
@@ -547,35 +850,8 @@ def inject_ayon_environment(deadlinePlugin):
                 " AYON_FOLDER_PATH, AYON_TASK_NAME, AYON_APP_NAME"
             ))
 
-        # Use applications addon arguments
-        # TODO validate if applications addon should be used
-        args = [
-            "--headless",
-            "addon",
-            "applications",
-            "extractenvironments",
-            export_url
-        ]
-
-        # staging requires passing argument
-        # TODO could be switched to env var after https://github.com/ynput/ayon-launcher/issues/123
-        settings_variant = job.GetJobEnvironmentKeyValue("AYON_DEFAULT_SETTINGS_VARIANT")  # noqa
-        if settings_variant == "staging":
-            args.append("--use-staging")
-
-        # Backwards compatibility for older versions
-        legacy_args = [
-            "--headless",
-            "extractenvironments",
-            export_url
-        ]
-
-        for key, value in add_kwargs.items():
-            args.extend(["--{}".format(key), value])
-            # Legacy arguments expect '--asset' instead of '--folder'
-            if key == "folder":
-                key = "asset"
-            legacy_args.extend(["--{}".format(key), value])
+        settings_variant = job.GetJobEnvironmentKeyValue(
+            "AYON_DEFAULT_SETTINGS_VARIANT")
 
         environment = {
             "AYON_SERVER_URL": ayon_server_url,
@@ -592,29 +868,25 @@ def inject_ayon_environment(deadlinePlugin):
             # Add the env var for current calls to `DeadlinePlugin.RunProcess`
             deadlinePlugin.SetProcessEnvironmentVariable(env, val)
 
-        args_str = subprocess.list2cmdline(args)
-        print(">>> Executing: {} {}".format(exe, args_str))
-        process_exitcode = deadlinePlugin.RunProcess(
-            exe, args_str, os.path.dirname(exe), -1
+        cache_key = get_environment_cache_key(
+            ayon_bundle_name,
+            settings_variant or "production",
+            add_kwargs["project"],
+            add_kwargs["folder"],
+            add_kwargs["task"],
+            add_kwargs["app"],
+            ayon_server_url,
+            # Environment differs per platform of worker
+            platform.system(),
+        )
+        contents = get_ayon_environment(
+            deadlinePlugin,
+            exe,
+            cache_key,
+            get_environment_cache_ttl(config),
+            add_kwargs,
+            settings_variant,
         )
-
-        if process_exitcode != 0:
-            print(
-                "Failed to run AYON process to extract environments. Trying"
-                " to use legacy arguments."
-            )
-            legacy_args_str = subprocess.list2cmdline(legacy_args)
-            process_exitcode = deadlinePlugin.RunProcess(
-                exe, legacy_args_str, os.path.dirname(exe), -1
-            )
-            if process_exitcode != 0:
-                raise RuntimeError(
-                    "Failed to run AYON process to extract environments."
-                )
-
-        print(">>> Loading file ...")
-        with open(export_url) as fp:
-            contents = json.load(fp)
 
         for key, value in contents.items():
             deadlinePlugin.SetProcessEnvironmentVariable(key, value)
@@ -631,9 +903,6 @@ def inject_ayon_environment(deadlinePlugin):
             print(">>> Setting script path {}".format(script_url))
             job.SetJobPluginInfoKeyValue("ScriptFilename", script_url)
 
-        print(">>> Removing temporary file")
-        os.remove(export_url)
-
         print(">> Injection end.")
     except Exception as e:
         if hasattr(e, "output"):
@@ -677,7 +946,7 @@ def get_ayon_executable():
 
 
 def inject_render_job_id(deadlinePlugin):
-    """Inject dependency ids to publish process as env var for validation."""
+    """Inject dependency ids and job id to publish process as env vars."""
     print(">>> Injecting render job id ...")
     job = deadlinePlugin.GetJob()
 
@@ -688,6 +957,10 @@ def inject_render_job_id(deadlinePlugin):
     deadlinePlugin.SetProcessEnvironmentVariable(
         "RENDER_JOB_IDS", render_job_ids
     )
+    # Publish job can be resubmitted when frames are missing
+    deadlinePlugin.SetProcessEnvironmentVariable(
+        "AYON_PUBLISH_JOB_ID", job.JobId
+    )
     print(">>> Injection end.")
 
 
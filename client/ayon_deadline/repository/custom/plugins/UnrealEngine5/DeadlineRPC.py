@@ -1,5 +1,8 @@
 #  Copyright Epic Games, Inc. All Rights Reserved
 
+import time
+import threading
+
 from ue_utils.rpc.server import RPCServerThread
 from ue_utils.rpc.base_server import BaseRPCServerManager
 
@@ -21,9 +24,15 @@ class BaseDeadlineRPCJobManager:
         # Get the current running job
         self._job = self._deadline_plugin.GetJob()
         self._is_connected = False
+        # Notifies threads waiting on a client to connect
+        self._connected = threading.Event()
+        self._start_time = time.time()
+        self._connection_time = None
 
         # Track all completed tasks
         self._completed_tasks = set()
+        # Notifies threads waiting on a task to complete
+        self._task_completed = threading.Condition()
 
     def connect(self):
         """
@@ -34,7 +43,10 @@ class BaseDeadlineRPCJobManager:
         the job after a few minutes
         :return: bool representing the connection
         """
+        if not self._is_connected:
+            self._connection_time = time.time() - self._start_time
         self._is_connected = True
+        self._connected.set()
         print("Server connection established!")
         return self._is_connected
 
@@ -45,6 +57,24 @@ class BaseDeadlineRPCJobManager:
         """
         return self._is_connected
 
+    def wait_for_connection(self, timeout=None):
+        """
+        Blocks until a client has connected or the timeout expires. Same as
+        `wait_for_task_complete`, this is meant to be called from the Deadline
+        process and not over RPC
+        :param timeout: Seconds to wait, None waits indefinitely
+        :return: bool representing the connection
+        """
+        return self._connected.wait(timeout)
+
+    def get_connection_time(self):
+        """
+        Returns the seconds it took a client to connect since the manager
+        was created
+        :return: Seconds or None if no client has connected
+        """
+        return self._connection_time
+
     def is_task_complete(self, task_id):
         """
         Checks and returns if a task has been marked as complete
@@ -53,6 +83,22 @@ class BaseDeadlineRPCJobManager:
         """
         return task_id in self._completed_tasks
 
+    def wait_for_task_complete(self, task_id, timeout=None):
+        """
+        Blocks until a task has been marked as complete or the timeout
+        expires. This is meant to be called from the Deadline process and not
+        over RPC, the XML-RPC server handles one request at a time and would
+        not be able to receive the `complete_task` call while waiting
+        :param task_id: job task id
+        :param timeout: Seconds to wait, None waits indefinitely
+        :return: return True/False if the task id is present
+        """
+        with self._task_completed:
+            return self._task_completed.wait_for(
+                lambda: task_id in self._completed_tasks,
+                timeout=timeout
+            )
+
     @staticmethod
     def __get_instance_from_globals():
         """
@@ -164,7 +210,9 @@ class BaseDeadlineRPCJobManager:
         :param task_id: Task ID to mark as complete
         :return:
         """
-        self._completed_tasks.add(task_id)
+        with self._task_completed:
+            self._completed_tasks.add(task_id)
+            self._task_completed.notify_all()
         return True
 
     def update_job_output_filenames(self, filenames):
@@ -234,8 +282,8 @@ class DeadlineRPCServerThread(RPCServerThread):
 
     deadline_job_manager = None
 
-    def __init__(self, name, port):
-        super(DeadlineRPCServerThread, self).__init__(name, port)
+    def __init__(self, name, port, transport=None):
+        super(DeadlineRPCServerThread, self).__init__(name, port, transport)
         if self.deadline_job_manager:
             self.deadline_job_manager = self.deadline_job_manager()
         else:
@@ -255,10 +303,11 @@ class DeadlineRPCServerManager(BaseRPCServerManager):
     non-blocking thread
     """
 
-    def __init__(self, deadline_plugin, port):
+    def __init__(self, deadline_plugin, port, transport=None):
         super(DeadlineRPCServerManager, self).__init__()
         self.name = "DeadlineRPCServer"
         self.port = port
+        self.transport = transport
         self.is_started = False
         self.__make_plugin_instance_global(deadline_plugin)
 
@@ -296,6 +345,17 @@ class DeadlineRPCServerManager(BaseRPCServerManager):
             return self.server_thread.deadline_job_manager.is_connected()
         return False
 
+    def get_job_manager(self):
+        """
+        Returns the job manager registered on the server thread. This allows
+        the Deadline process to wait on the manager directly instead of
+        polling it over RPC
+        :return: Deadline RPC job manager
+        """
+        if not self.server_thread:
+            raise RuntimeError("There is no server thread for this Manager")
+        return self.server_thread.deadline_job_manager
+
     def get_temporary_client_proxy(self):
         """
         This returns client proxy and is not necessarily expected to be used
@@ -308,7 +368,9 @@ class DeadlineRPCServerManager(BaseRPCServerManager):
         # Get the port the server is using
         server = self.get_server()
         _, server_port = server.socket.getsockname()
-        return RPCClient(port=int(server_port)).proxy
+        return RPCClient(
+            port=int(server_port), transport=self.transport
+        ).proxy
 
     def shutdown(self):
         """
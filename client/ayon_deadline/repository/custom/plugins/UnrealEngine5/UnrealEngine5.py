@@ -17,6 +17,11 @@ from DeadlineRPC import (
     BaseDeadlineRPCJobManager
 )
 
+# Seconds between stdout flushes while waiting on a task to complete
+STDOUT_FLUSH_INTERVAL = 1.0
+# Seconds between log messages while waiting on a client connection
+CONNECTION_LOG_INTERVAL = 30
+
 
 def GetDeadlinePlugin():
     """
@@ -39,8 +44,8 @@ class UnrealEnginePlugin(DeadlinePlugin):
     NB: This plugin makes no assumptions about what the render job is but has a
     few expectations. This plugin runs as a server in the deadline process
     and exposes a few Deadline functionalities over XML RPC. The managed process
-    used by this plugin waits for a client to connect and continuously polls the
-    RPC server till a task has been marked complete before exiting the
+    used by this plugin waits for a client to connect and waits on the
+    RPC job manager till a task has been marked complete before exiting the
     process. This behavior however has a drawback. If for some reason your
     process does not mark a task complete after working on a command,
     the plugin will run the current task indefinitely until specified to
@@ -145,7 +150,12 @@ class UnrealEnginePlugin(DeadlinePlugin):
         # store an instance of this plugin in the python globals. This should
         # allow threads in the process to get an instance of the plugin without
         # passing the data down through the thread instance
-        _deadline_rpc_manager = DeadlineRPCServerManager(self, port)
+        # Transport of the server, the Unreal process gets it from the
+        # process environment variables
+        transport = self.GetConfigEntryWithDefault("RPCTransport", "xmlrpc")
+        _deadline_rpc_manager = DeadlineRPCServerManager(
+            self, port, transport=transport
+        )
 
         # We would like to run the server in a thread to not block deadline's
         # process. Get the Deadline RPC thread class. Set the class that is
@@ -215,6 +225,10 @@ class UnrealEnginePlugin(DeadlinePlugin):
                 self.SetProcessEnvironmentVariable(
                     "DEADLINE_RPC_PORT", str(server_port)
                 )
+                self.SetProcessEnvironmentVariable(
+                    "DEADLINE_RPC_TRANSPORT",
+                    self._deadline_rpc_manager.transport
+                )
 
             # Fail if we don't have an instance to a managed process.
             # This should typically return true
@@ -335,7 +349,6 @@ class UnrealEngineManagedProcess(ManagedProcess):
         self.RenderArgumentCallback += self._render_argument
         self._deadline_plugin = deadline_plugin
         self._deadline_rpc_manager = deadline_rpc_manager
-        self._temp_rpc_client = None
         self._name = process_name
         self._executable_path = None
 
@@ -425,46 +438,52 @@ class UnrealEngineManagedProcess(ManagedProcess):
         # Start a timer to monitor the process time
         start_time = time.time()
 
-        # Get temp client connection
-        if not self._temp_rpc_client:
-            self._temp_rpc_client = self._deadline_rpc_manager.get_temporary_client_proxy()
-
-
-        print("Is server and client connected?", self._temp_rpc_client.is_connected())
+        job_manager = self._deadline_rpc_manager.get_job_manager()
 
         # Make sure we have a manager running, and we can establish a connection
-        if not self._temp_rpc_client.is_connected():
-            # Wait for a connection. This polls the server thread till an
-            # unreal process client has connected. It is very important that
+        if not job_manager.is_connected():
+            # Wait for a connection. The job manager signals when an unreal
+            # process client has connected. It is very important that
             # a connection is established by the client to allow this process
             # to execute.
-            while round(time.time() - start_time) <= self._process_wait_time:
-                try:
-                    # keep checking to see if a client has connected
-                    if self._temp_rpc_client.is_connected():
-                        self._deadline_plugin.LogInfo(
-                            "Client connection established!!"
-                        )
-                        break
-                except Exception:
-                    pass
-
-                self._deadline_plugin.LogInfo("Waiting on client connection..")
+            self._deadline_plugin.LogInfo("Waiting on client connection..")
+            last_log_time = start_time
+            while not job_manager.wait_for_connection(
+                timeout=STDOUT_FLUSH_INTERVAL
+            ):
                 self._deadline_plugin.FlushMonitoredManagedProcessStdout(
                     self._name
                 )
-                time.sleep(2)
-            else:
-
-                # Fail the render after waiting too long
-                self._deadline_plugin.FailRender(
-                    "A connection was not established with an unreal process"
+                current_time = time.time()
+                if current_time - start_time > self._process_wait_time:
+                    # Fail the render after waiting too long
+                    self._deadline_plugin.FailRender(
+                        "A connection was not established with an unreal process"
+                    )
+                    return
+
+                if current_time - last_log_time >= CONNECTION_LOG_INTERVAL:
+                    self._deadline_plugin.LogInfo(
+                        "Waiting on client connection.. ({:.0f}s)".format(
+                            current_time - start_time
+                        )
+                    )
+                    last_log_time = current_time
+
+            self._deadline_plugin.LogInfo(
+                "Client connection established!! Task waited {:.2f}s, "
+                "client connected {:.2f}s after the server started".format(
+                    time.time() - start_time,
+                    job_manager.get_connection_time()
                 )
+            )
 
         # if we are connected, wait till the process task is marked as
-        # complete.
-        while not self._temp_rpc_client.is_task_complete(
-            self._deadline_plugin.GetCurrentTaskId()
+        # complete. The job manager lives in this process, so wait on it
+        # directly and wake up only to flush stdout
+        while not job_manager.wait_for_task_complete(
+            self._deadline_plugin.GetCurrentTaskId(),
+            timeout=STDOUT_FLUSH_INTERVAL
         ):
             # Keep flushing stdout
             self._deadline_plugin.FlushMonitoredManagedProcessStdout(self._name)
@@ -1,11 +1,15 @@
 import os
 import sys
 import abc
+import json
 import queue
 import time
+import struct
 import logging
 import threading
-from xmlrpc.server import SimpleXMLRPCServer
+import socketserver
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from xmlrpc.server import SimpleXMLRPCServer, SimpleXMLRPCDispatcher
 
 # importlib machinery needs to be available for importing client modules
 from importlib.machinery import SourceFileLoader
@@ -13,35 +17,140 @@ from importlib.machinery import SourceFileLoader
 logger = logging.getLogger(__name__)
 
 EXECUTION_QUEUE = queue.Queue()
-RETURN_VALUE_NAME = 'RPC_SERVER_RETURN_VALUE'
-ERROR_VALUE_NAME = 'RPC_SERVER_ERROR_VALUE'
+
+XMLRPC_TRANSPORT = 'xmlrpc'
+JSON_TRANSPORT = 'json'
+# JSON transport messages are prefixed with their length as unsigned 32bit big endian integer
+MESSAGE_HEADER = struct.Struct('>I')
+
+
+class MainThreadCall:
+    def __init__(self, callable_instance, args):
+        """
+        A call waiting in the execution queue. Each call has its own future,
+        so concurrent calls never share their return values.
+
+        :param call callable_instance: A callable.
+        :param tuple args: The arguments of the call.
+        """
+        self.callable_instance = callable_instance
+        self.args = args
+        self.future = Future()
+        self.queued_time = time.perf_counter()
+
+    @property
+    def name(self):
+        return getattr(
+            self.callable_instance, '__name__', repr(self.callable_instance)
+        )
+
+    def run(self):
+        """
+        Runs the call and resolves its future, which wakes up the caller.
+        """
+        # the caller may have timed out and cancelled the call
+        if not self.future.set_running_or_notify_cancel():
+            return
+
+        start_time = time.perf_counter()
+        try:
+            result = self.callable_instance(*self.args)
+        except BaseException as error:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+        finally:
+            CALL_METRICS.record(
+                self.name,
+                start_time - self.queued_time,
+                time.perf_counter() - start_time
+            )
+
+
+class CallMetrics:
+    def __init__(self):
+        """
+        Latency metrics of calls run in the main thread, by callable name.
+        """
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def record(self, name, wait_time, run_time):
+        """
+        Records a finished call.
+
+        :param str name: The name of the callable.
+        :param float wait_time: Seconds the call waited in the queue.
+        :param float run_time: Seconds the call ran in the main thread.
+        """
+        with self._lock:
+            metrics = self._metrics.setdefault(name, {
+                'count': 0,
+                'wait_total': 0.0,
+                'wait_max': 0.0,
+                'run_total': 0.0,
+                'run_max': 0.0,
+            })
+            metrics['count'] += 1
+            metrics['wait_total'] += wait_time
+            metrics['wait_max'] = max(metrics['wait_max'], wait_time)
+            metrics['run_total'] += run_time
+            metrics['run_max'] = max(metrics['run_max'], run_time)
+
+    def get(self):
+        """
+        Gets a copy of the metrics.
+
+        :return dict: The metrics of each callable with call count, total and max seconds spent waiting
+        in the queue and running.
+        """
+        with self._lock:
+            return {
+                name: dict(metrics)
+                for name, metrics in self._metrics.items()
+            }
+
+    def reset(self):
+        """
+        Clears the recorded metrics.
+        """
+        with self._lock:
+            self._metrics.clear()
+
+
+CALL_METRICS = CallMetrics()
+
+
+def get_call_metrics():
+    """
+    Gets the latency metrics of calls run in the main thread.
+
+    :return dict: The metrics by callable name.
+    """
+    return CALL_METRICS.get()
 
 
 def run_in_main_thread(callable_instance, *args):
     """
     Runs the provided callable instance in the main thread by added it to a que
     that is processed by a recurring event in an integration like a timer.
+    The caller is woken up as soon as the call finishes and more calls can be
+    in flight at the same time.
 
     :param call callable_instance: A callable.
     :return: The return value of any call from the client.
     """
     timeout = int(os.environ.get('RPC_TIME_OUT', 20))
 
-    globals().pop(RETURN_VALUE_NAME, None)
-    globals().pop(ERROR_VALUE_NAME, None)
-    EXECUTION_QUEUE.put((callable_instance, args))
+    call = MainThreadCall(callable_instance, args)
+    EXECUTION_QUEUE.put(call)
 
-    for attempt in range(timeout * 10):
-        if RETURN_VALUE_NAME in globals():
-            return globals().get(RETURN_VALUE_NAME)
-        elif ERROR_VALUE_NAME in globals():
-            raise globals()[ERROR_VALUE_NAME]
-        else:
-            time.sleep(0.1)
-
-    if RETURN_VALUE_NAME not in globals():
+    try:
+        return call.future.result(timeout)
+    except FutureTimeoutError:
+        call.future.cancel()
         raise TimeoutError(
-            f'The call "{callable_instance.__name__}" timed out because it hit the timeout limit'
+            f'The call "{call.name}" timed out because it hit the timeout limit'
             f' of {timeout} seconds.'
         )
 
@@ -49,20 +158,117 @@ def run_in_main_thread(callable_instance, *args):
 def execute_queued_calls(*extra_args):
     """
     Runs calls in the execution que till they are gone. Designed to be passed to a
-    recurring event in an integration like a timer.
+    recurring event in an integration like a timer. Errors are passed to the callers.
+    """
+    while True:
+        try:
+            call = EXECUTION_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        call.run()
+
+
+class UnregisteredCallableError(LookupError):
+    """
+    Raised when a callable is called by the hash of its code, but the code was not registered with the server.
+    """
+
+
+def get_transport(transport=None):
+    """
+    Gets the RPC transport. If not provided, it is taken from the `RPC_TRANSPORT` environment variable
+    and defaults to XML-RPC.
+
+    :param str transport: The name of the transport, `xmlrpc` or `json`.
+    :return str: The name of the transport.
+    """
+    transport = transport or os.environ.get('RPC_TRANSPORT') or XMLRPC_TRANSPORT
+    if transport not in (XMLRPC_TRANSPORT, JSON_TRANSPORT):
+        raise ValueError(f'Unknown RPC transport "{transport}".')
+    return transport
+
+
+def encode_message(message):
     """
-    while not EXECUTION_QUEUE.empty():
-        if RETURN_VALUE_NAME not in globals():
-            callable_instance, args = EXECUTION_QUEUE.get()
+    Encodes a message of the JSON transport.
+
+    :param dict message: The message.
+    :return bytes: The length prefixed message.
+    """
+    data = json.dumps(message).encode('utf-8')
+    return MESSAGE_HEADER.pack(len(data)) + data
+
+
+def read_message(stream):
+    """
+    Reads a message of the JSON transport.
+
+    :param stream: A binary file object of the socket.
+    :return dict: The message or None if the connection was closed.
+    """
+    header = stream.read(MESSAGE_HEADER.size)
+    if not header:
+        return None
+
+    if len(header) != MESSAGE_HEADER.size:
+        raise ConnectionError('The connection was closed in the middle of a message.')
+
+    size = MESSAGE_HEADER.unpack(header)[0]
+    data = stream.read(size)
+    if len(data) != size:
+        raise ConnectionError('The connection was closed in the middle of a message.')
+    return json.loads(data.decode('utf-8'))
+
+
+class BaseServer(SimpleXMLRPCServer):
+    def serve_until_killed(self):
+        """
+        Serves till killed by the client.
+        """
+        self.quit = False
+        while not self.quit:
+            self.handle_request()
+
+
+class JSONRPCRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        """
+        Handles calls of a client till it closes the connection.
+        """
+        while True:
             try:
-                globals()[RETURN_VALUE_NAME] = callable_instance(*args)
+                request = read_message(self.rfile)
+            except (ConnectionError, ValueError):
+                logger.warning('Received an invalid JSON RPC message.')
+                return
+
+            if request is None:
+                return
+
+            try:
+                result = self.server._dispatch(request['method'], request.get('params', []))
+                response = encode_message({'result': result})
             except Exception as error:
-                # store the error in the globals and re-raise it
-                globals()[ERROR_VALUE_NAME] = error
-                raise error
+                # same format as XML-RPC faults, so clients can marshall the exceptions the same way
+                response = encode_message({
+                    'error': {'code': 1, 'message': f'{type(error)}:{error}'}
+                })
+            self.wfile.write(response)
 
 
-class BaseServer(SimpleXMLRPCServer):
+class JSONRPCServer(socketserver.ThreadingTCPServer, SimpleXMLRPCDispatcher):
+    """
+    Serves the same functions as `BaseServer`, but with length prefixed JSON messages over persistent
+    connections instead of a HTTP request with XML body for each call. Each connection is handled in
+    its own thread.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, logRequests=False, allow_none=True):
+        SimpleXMLRPCDispatcher.__init__(self, allow_none=allow_none, encoding=None)
+        socketserver.ThreadingTCPServer.__init__(self, address, JSONRPCRequestHandler)
+
     def serve_until_killed(self):
         """
         Serves till killed by the client.
@@ -73,24 +279,34 @@ class BaseServer(SimpleXMLRPCServer):
 
 
 class BaseRPCServer:
-    def __init__(self, name, port, is_thread=False):
+    def __init__(self, name, port, is_thread=False, transport=None):
         """
         Initialize the base server.
 
         :param str name: The name of the server.
         :param int port: The number of the server port.
         :param bool is_thread: Whether or not the server is encapsulated in a thread.
+        :param str transport: The name of the transport, `xmlrpc` or `json`.
         """
-        self.server = BaseServer(
+        if get_transport(transport) == JSON_TRANSPORT:
+            server_class = JSONRPCServer
+        else:
+            server_class = BaseServer
+
+        self.server = server_class(
             (os.environ.get('RPC_HOST', '127.0.0.1'), port),
             logRequests=False,
             allow_none=True
         )
         self.is_thread = is_thread
+        # callables registered with the server by the hash of their code
+        self.registered_callables = {}
         self.server.register_function(self.add_new_callable)
+        self.server.register_function(self.call_registered_callable)
         self.server.register_function(self.kill)
         self.server.register_function(self.is_running)
         self.server.register_function(self.set_env)
+        self.server.register_function(get_call_metrics)
         self.server.register_introspection_functions()
         self.server.register_multicall_functions()
         logger.info(f'Started RPC server "{name}".')
@@ -119,7 +335,7 @@ class BaseRPCServer:
         self.server.quit = True
         return True
 
-    def add_new_callable(self, callable_name, code, client_system_path, remap_pairs=None):
+    def add_new_callable(self, callable_name, code, client_system_path, remap_pairs=None, code_hash=None):
         """
         Adds a new callable defined in the client to the server.
 
@@ -129,8 +345,13 @@ class BaseRPCServer:
         :param list(tuple) remap_pairs: A list of tuples with first value being the client python path root and the
         second being the new server path root. This can be useful if the client and server are on two different file
         systems and the root of the import paths need to be dynamically replaced.
+        :param str code_hash: Optionally, the hash of the code. The code is then compiled only once for the lifetime
+        of the server and the callable can be called with `call_registered_callable`.
         :return str: A response message back to the client.
         """
+        if code_hash and code_hash in self.registered_callables:
+            return f'The function "{callable_name}" is already registered with the server!'
+
         for path in client_system_path:
             # if a list of remap pairs are provided, they will be remapped before being added to the system path
             for client_path_root, matching_server_path_root in remap_pairs or []:
@@ -159,19 +380,38 @@ class BaseRPCServer:
                     callable_instance,
                     callable_name
                 )
+
+            if code_hash:
+                self.registered_callables[code_hash] = self.server.funcs[callable_name]
         return f'The function "{callable_name}" has been successfully registered with the server!'
 
+    def call_registered_callable(self, code_hash, args):
+        """
+        Calls a callable registered with the server by the hash of its code. This allows clients to send only
+        the hash and the arguments instead of the code with every call.
+
+        :param str code_hash: The hash of the code of the callable.
+        :param list args: The arguments of the call.
+        :return: The return value of the callable.
+        """
+        try:
+            callable_instance = self.registered_callables[code_hash]
+        except KeyError:
+            raise UnregisteredCallableError(f'No callable is registered with the code hash "{code_hash}".')
+        return callable_instance(*args)
+
 
 class BaseRPCServerThread(threading.Thread, BaseRPCServer):
-    def __init__(self, name, port):
+    def __init__(self, name, port, transport=None):
         """
         Initialize the base rpc server.
 
         :param str name: The name of the server.
         :param int port: The number of the server port.
+        :param str transport: The name of the transport, `xmlrpc` or `json`.
         """
         threading.Thread.__init__(self, name=name, daemon=True)
-        BaseRPCServer.__init__(self, name, port, is_thread=True)
+        BaseRPCServer.__init__(self, name, port, is_thread=True, transport=transport)
 
     def run(self):
         """
@@ -193,7 +433,9 @@ class BaseRPCServerManager:
         """
         Initialize the server manager.
         Note: when this class is subclassed `name`, `port`, `threaded_server_class` need to be defined.
+        `transport` can be set to select the transport of the server.
         """
+        self.transport = None
         self.server_thread = None
         self.server_blocking = None
         self._server = None
@@ -202,7 +444,7 @@ class BaseRPCServerManager:
         """
         Starts the server in a thread.
         """
-        self.server_thread = self.threaded_server_class(self.name, self.port)
+        self.server_thread = self.threaded_server_class(self.name, self.port, self.transport)
         self._server = self.server_thread.server
         self.server_thread.start()
 
@@ -211,7 +453,7 @@ class BaseRPCServerManager:
         Starts the server in the main thread, which blocks all other processes. This can only
         be killed by the client.
         """
-        self.server_blocking = BaseRPCServer(self.name, self.port)
+        self.server_blocking = BaseRPCServer(self.name, self.port, transport=self.transport)
         self._server = self.server_blocking.server
         self._server.serve_until_killed()
 
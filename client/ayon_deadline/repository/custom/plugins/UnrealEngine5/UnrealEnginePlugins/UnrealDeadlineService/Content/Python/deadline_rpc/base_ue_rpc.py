@@ -104,7 +104,10 @@ class BaseRPC:
         """
         print(f"Connecting to rpc server on port `{self._port}`")
         try:
-            _client = RPCClient(port=int(self._port))
+            _client = RPCClient(
+                port=int(self._port),
+                transport=os.environ.get("DEADLINE_RPC_TRANSPORT")
+            )
             proxy = _client.proxy
             proxy.connect()
         except Exception:
@@ -10,7 +10,9 @@ class RPCServerThread(BaseRPCServerThread):
         """
         Implementation of a thread safe call in Unreal.
         """
-        return callable_instance(*args)
+        def wrapper(*args):
+            return callable_instance(*args)
+        return wrapper
 
 
 class RPCServer(BaseRPCServerManager):
@@ -3,8 +3,11 @@
 
 import os
 import re
+import socket
 import logging
 import inspect
+import builtins
+import threading
 from xmlrpc.client import (
     ServerProxy,
     Unmarshaller,
@@ -13,28 +16,58 @@ from xmlrpc.client import (
     Fault,
     ResponseError
 )
+
+from .base_server import (
+    JSON_TRANSPORT,
+    get_transport,
+    encode_message,
+    read_message
+)
 logger = logging.getLogger(__package__)
 
+ERROR_PATTERN = re.compile(r'(?P<exception>[^:]*):(?P<exception_message>.*$)')
 
-class RPCUnmarshaller(Unmarshaller):
-    def __init__(self, *args, **kwargs):
-        Unmarshaller.__init__(self, *args, **kwargs)
-        self.error_pattern = re.compile(r'(?P<exception>[^:]*):(?P<exception_message>.*$)')
-        self.builtin_exceptions = self._get_built_in_exceptions()
 
-    @staticmethod
-    def _get_built_in_exceptions():
-        """
-        Gets a list of the built in exception classes in python.
+def get_built_in_exceptions():
+    """
+    Gets a list of the built in exception classes in python.
 
-        :return list[BaseException] A list of the built in exception classes in python:
-        """
-        builtin_exceptions = []
-        for builtin_name, builtin_class in globals().get('__builtins__').items():
-            if inspect.isclass(builtin_class) and issubclass(builtin_class, BaseException):
-                builtin_exceptions.append(builtin_class)
+    :return list[BaseException] A list of the built in exception classes in python:
+    """
+    builtin_exceptions = []
+    for builtin_name, builtin_class in vars(builtins).items():
+        if inspect.isclass(builtin_class) and issubclass(builtin_class, BaseException):
+            builtin_exceptions.append(builtin_class)
+
+    return builtin_exceptions
+
+
+def raise_fault(fault_code, fault_string, builtin_exceptions):
+    """
+    Raises the built in exception the fault was created from, or the fault itself.
 
-        return builtin_exceptions
+    :param int fault_code: The code of the fault.
+    :param str fault_string: The fault string in format `<class 'ExceptionName'>:message`.
+    :param list[BaseException] builtin_exceptions: The built in exception classes that can be raised.
+    """
+    match = ERROR_PATTERN.match(fault_string)
+    if match:
+        exception_name = match.group('exception').strip("<class '").strip("'>")
+        exception_message = match.group('exception_message')
+
+        if exception_name:
+            for exception in builtin_exceptions:
+                if exception.__name__ == exception_name:
+                    raise exception(exception_message)
+
+    # if all else fails just raise the fault
+    raise Fault(fault_code, fault_string)
+
+
+class RPCUnmarshaller(Unmarshaller):
+    def __init__(self, *args, **kwargs):
+        Unmarshaller.__init__(self, *args, **kwargs)
+        self.builtin_exceptions = get_built_in_exceptions()
 
     def close(self):
         """
@@ -47,18 +80,11 @@ class RPCUnmarshaller(Unmarshaller):
 
         if self._type == 'fault':
             marshallables = self._stack[0]
-            match = self.error_pattern.match(marshallables.get('faultString', ''))
-            if match:
-                exception_name = match.group('exception').strip("<class '").strip("'>")
-                exception_message = match.group('exception_message')
-
-                if exception_name:
-                    for exception in self.builtin_exceptions:
-                        if exception.__name__ == exception_name:
-                            raise exception(exception_message)
-
-            # if all else fails just raise the fault
-            raise Fault(**marshallables)
+            raise_fault(
+                marshallables.get('faultCode'),
+                marshallables.get('faultString', ''),
+                self.builtin_exceptions
+            )
         return tuple(self._stack)
 
 
@@ -83,24 +109,135 @@ class RPCServerProxy(ServerProxy):
         ServerProxy.__init__(self, *args, **kwargs)
 
 
+class _JSONRPCMethod:
+    def __init__(self, proxy, name):
+        """
+        A remote method of the JSON RPC proxy, supports nested names like `system.listMethods`.
+        """
+        self._proxy = proxy
+        self._name = name
+
+    def __getattr__(self, name):
+        return _JSONRPCMethod(self._proxy, f'{self._name}.{name}')
+
+    def __call__(self, *args):
+        return self._proxy._request(self._name, args)
+
+
+class JSONRPCServerProxy:
+    def __init__(self, host, port, marshall_exceptions=True):
+        """
+        Proxy of a JSON RPC server with the same interface as the XML-RPC server proxy. Calls are sent
+        over a single persistent connection, which is opened on the first call.
+
+        :param str host: The host of the server.
+        :param int port: The port of the server.
+        :param bool marshall_exceptions: Whether or not the exceptions should be marshalled.
+        """
+        self._address = (host, port)
+        self._marshall_exceptions = marshall_exceptions
+        self._builtin_exceptions = get_built_in_exceptions()
+        self._lock = threading.Lock()
+        self._socket = None
+        self._reader = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return _JSONRPCMethod(self, name)
+
+    def __call__(self, attr):
+        """
+        A workaround to get special attributes of the proxy, same as the XML-RPC server proxy.
+        """
+        if attr == 'close':
+            return self._close
+        raise AttributeError(f'Attribute {attr} not found')
+
+    def _connect(self):
+        self._socket = socket.create_connection(self._address)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._socket.makefile('rb')
+
+    def _close(self):
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+        self._socket = None
+        self._reader = None
+
+    def _send_request(self, request):
+        self._socket.sendall(request)
+        response = read_message(self._reader)
+        if response is None:
+            raise ConnectionResetError('The connection was closed by the server.')
+        return response
+
+    def _request(self, method, params):
+        """
+        Calls a method on the server.
+
+        :param str method: The name of the method.
+        :param tuple params: The arguments of the method.
+        :return: The return value of the method.
+        """
+        request = encode_message({'method': method, 'params': list(params)})
+        with self._lock:
+            reused = self._socket is not None
+            if not reused:
+                self._connect()
+
+            try:
+                response = self._send_request(request)
+            except (ConnectionResetError, ConnectionAbortedError, BrokenPipeError):
+                self._close()
+                # the server may have closed the idle connection, retry once like the XML-RPC transport
+                if not reused:
+                    raise
+                self._connect()
+                try:
+                    response = self._send_request(request)
+                except Exception:
+                    self._close()
+                    raise
+            except Exception:
+                self._close()
+                raise
+
+        if 'error' in response:
+            error = response['error']
+            if self._marshall_exceptions:
+                raise_fault(error['code'], error['message'], self._builtin_exceptions)
+            raise Fault(error['code'], error['message'])
+        return response['result']
+
+
 class RPCClient:
-    def __init__(self, port, marshall_exceptions=True):
+    def __init__(self, port, marshall_exceptions=True, transport=None):
         """
         Initializes the rpc client.
 
         :param int port: A port number the client should connect to.
         :param bool marshall_exceptions: Whether or not the exceptions should be marshalled.
+        :param str transport: The name of the transport, `xmlrpc` or `json`. Defaults to the `RPC_TRANSPORT`
+        environment variable or `xmlrpc`.
         """
-        if marshall_exceptions:
-            proxy_class = RPCServerProxy
-        else:
-            proxy_class = ServerProxy
-
         server_ip = os.environ.get('RPC_SERVER_IP', '127.0.0.1')
+        self.transport = get_transport(transport)
 
-        self.proxy = proxy_class(
-            "http://{server_ip}:{port}".format(server_ip=server_ip, port=port),
-            allow_none=True,
-        )
+        if self.transport == JSON_TRANSPORT:
+            self.proxy = JSONRPCServerProxy(
+                server_ip, int(port), marshall_exceptions=marshall_exceptions
+            )
+        else:
+            if marshall_exceptions:
+                proxy_class = RPCServerProxy
+            else:
+                proxy_class = ServerProxy
+
+            self.proxy = proxy_class(
+                "http://{server_ip}:{port}".format(server_ip=server_ip, port=port),
+                allow_none=True,
+            )
         self.marshall_exceptions = marshall_exceptions
         self.port = port
@@ -4,14 +4,17 @@
 import os
 import re
 import sys
+import hashlib
 import logging
 import types
 import inspect
 import textwrap
 import unittest
+import threading
 from xmlrpc.client import Fault
 
 from .client import RPCClient
+from .base_server import UnregisteredCallableError, get_transport
 from .validations import (
     validate_key_word_parameters,
     validate_class_method,
@@ -23,6 +26,33 @@ from .validations import (
 
 logger = logging.getLogger(__package__)
 
+# code of callables and its hash, by the callable, its imports, remap pairs and modification time of its file
+CODE_CACHE = {}
+# callables registered with servers during the lifetime of this process, by server address and code hash
+REGISTERED_CALLABLES = set()
+# rpc clients of the current thread, by port, server ip and transport
+_RPC_CLIENTS = threading.local()
+
+
+def get_rpc_client(port, transport=None):
+    """
+    Gets the rpc client for the given port and transport. The client is created once per thread, so the connection
+    of the persistent transport is reused by following calls.
+
+    :param int port: A port number the client should connect to.
+    :param str transport: The name of the transport, `xmlrpc` or `json`.
+    :return RPCClient: The rpc client.
+    """
+    clients = getattr(_RPC_CLIENTS, 'clients', None)
+    if clients is None:
+        clients = _RPC_CLIENTS.clients = {}
+
+    key = (int(port), os.environ.get('RPC_SERVER_IP', '127.0.0.1'), get_transport(transport))
+    rpc_client = clients.get(key)
+    if rpc_client is None:
+        rpc_client = clients[key] = RPCClient(port, transport=transport)
+    return rpc_client
+
 
 class RPCFactory:
     def __init__(self, rpc_client, remap_pairs=None, default_imports=None):
@@ -39,7 +69,7 @@ class RPCFactory:
         :param callable function: A callable.
         :return str: The new code of the callable with all its references added.
         """
-        import_code = self.default_imports
+        import_code = list(self.default_imports)
 
         client_module = inspect.getmodule(function)
         self.file_path = get_source_file_path(function)
@@ -96,14 +126,75 @@ class RPCFactory:
 
         return code
 
-    def _register(self, function):
+    def _get_code_with_hash(self, function):
+        """
+        Gets the code of a callable and its hash. The code is extracted only once until the file of the
+        callable is modified.
+
+        :param callable function: A callable.
+        :return tuple(str, str): The code of the callable and its hash.
+        """
+        cache_key = (
+            function,
+            tuple(self.default_imports),
+            tuple(tuple(pair) for pair in self.remap_pairs or []),
+            os.path.getmtime(get_source_file_path(function))
+        )
+        code_with_hash = CODE_CACHE.get(cache_key)
+        if code_with_hash is None:
+            code = '\n'.join(self._get_code(function))
+            code_hash = hashlib.sha1(f'{function.__name__}\n{code}'.encode('utf-8')).hexdigest()
+            code_with_hash = CODE_CACHE[cache_key] = (code, code_hash)
+        return code_with_hash
+
+    def _get_server_address(self):
+        """
+        Gets the address of the server the client connects to.
+
+        :return tuple: The transport, host and port of the server.
+        """
+        return (
+            getattr(self.rpc_client, 'transport', None),
+            os.environ.get('RPC_SERVER_IP', '127.0.0.1'),
+            int(self.rpc_client.port)
+        )
+
+    def _get_remote_function(self, function):
+        """
+        Gets a callable which calls the function on the server. The code of the function is sent and
+        compiled only once for the lifetime of the server, following calls send only its hash and arguments.
+
+        :param callable function: A callable.
+        :return callable: A remote callable.
+        """
+        code, code_hash = self._get_code_with_hash(function)
+        registration_key = (self._get_server_address(), code_hash)
+        if registration_key not in REGISTERED_CALLABLES:
+            self._register(function, code, code_hash)
+            REGISTERED_CALLABLES.add(registration_key)
+
+        def remote_function(*args):
+            try:
+                return self.rpc_client.proxy.call_registered_callable(code_hash, list(args))
+            except Fault as fault:
+                if UnregisteredCallableError.__name__ not in fault.faultString:
+                    raise
+
+            # the server was restarted since the code was registered
+            self._register(function, code, code_hash)
+            return self.rpc_client.proxy.call_registered_callable(code_hash, list(args))
+
+        return remote_function
+
+    def _register(self, function, code, code_hash):
         """
         Registers a given callable with the server.
 
         :param  callable function: A callable.
+        :param str code: The code of the callable.
+        :param str code_hash: The hash of the code.
         :return Any: The return value.
         """
-        code = self._get_code(function)
         try:
             # if additional paths are explicitly set, then use them. This is useful with the client is on another
             # machine and the python paths are different
@@ -114,8 +205,10 @@ class RPCFactory:
                 additional_paths = sys.path
 
             response = self.rpc_client.proxy.add_new_callable(
-                function.__name__, '\n'.join(code),
-                additional_paths
+                function.__name__, code,
+                additional_paths,
+                None,
+                code_hash
             )
             if os.environ.get('RPC_DEBUG'):
                 logger.debug(response)
@@ -135,13 +228,10 @@ class RPCFactory:
         validate_arguments(function, args)
 
         # get the remote function instance
-        self._register(function)
-        remote_function = getattr(self.rpc_client.proxy, function.__name__)
+        remote_function = self._get_remote_function(function)
 
-        current_frame = inspect.currentframe()
-        outer_frame_info = inspect.getouterframes(current_frame)
-        # step back 2 frames in the callstack
-        caller_frame = outer_frame_info[2][0]
+        # step back 2 frames in the callstack, 'inspect.getouterframes' would read source of all frames
+        caller_frame = inspect.currentframe().f_back.f_back
         # create a trace back that is relevant to the remote code rather than the code transporting it
         call_traceback = types.TracebackType(None, caller_frame, caller_frame.f_lasti, caller_frame.f_lineno)
         # call the remote function
@@ -159,7 +249,7 @@ class RPCFactory:
             raise exception.__class__(stack_trace).with_traceback(call_traceback)
 
 
-def remote_call(port, default_imports=None, remap_pairs=None):
+def remote_call(port, default_imports=None, remap_pairs=None, transport=None):
     """
     A decorator that makes this function run remotely.
 
@@ -168,13 +258,15 @@ def remote_call(port, default_imports=None, remap_pairs=None):
     :param list(tuple) remap_pairs: A list of tuples with first value being the client file path root and the
     second being the matching server path root. This can be useful if the client and server are on two different file
     systems and the root of the import paths need to be dynamically replaced.
+    :param str transport: The name of the transport, `xmlrpc` or `json`, which must match the server. Defaults to the
+    `RPC_TRANSPORT` environment variable or `xmlrpc`.
     """
     def decorator(function):
         def wrapper(*args, **kwargs):
             validate_file_is_saved(function)
             validate_key_word_parameters(function, kwargs)
             rpc_factory = RPCFactory(
-                rpc_client=RPCClient(port),
+                rpc_client=get_rpc_client(port, transport),
                 remap_pairs=remap_pairs,
                 default_imports=default_imports
             )
@@ -206,6 +298,7 @@ class RPCTestCase(unittest.TestCase):
     port = None
     remap_pairs = None
     default_imports = None
+    transport = None
 
     @classmethod
     def run_remotely(cls, method, args):
@@ -217,8 +310,9 @@ class RPCTestCase(unittest.TestCase):
         default_imports = cls.__dict__.get('default_imports', None)
         port = cls.__dict__.get('port', None)
         remap_pairs = cls.__dict__.get('remap_pairs', None)
+        transport = cls.__dict__.get('transport', None)
         rpc_factory = RPCFactory(
-            rpc_client=RPCClient(port),
+            rpc_client=get_rpc_client(port, transport),
             default_imports=default_imports,
             remap_pairs=remap_pairs
         )
@@ -0,0 +1,702 @@
+# -*- coding: utf-8 -*-
+"""Asynchronous submission of jobs to Deadline.
+
+Payloads are stored to a local in-flight directory and posted to Deadline
+Webservice by a background thread, so publishing can continue while
+submission requests are in flight.
+
+Each enqueued submission gets a placeholder job id which can be used
+in dependencies of following submissions. Submissions are posted in
+order in which they were enqueued, placeholders are replaced with real
+job ids right before payload is posted.
+
+When spooling on failure is enabled, payloads which can't be posted
+because Deadline Webservice is unavailable (and all payloads depending
+on them) stay in the spool directory. They can be submitted later with
+`replay_spooled_submissions`, which rewrites placeholder ids in
+dependencies as real job ids come back. In-flight payloads are moved to
+the spool directory only then, so replay never submits payloads which are
+being posted or which failed for other reasons. In-flight payloads left
+behind by process which ended before posting them are recovered to the
+spool directory by replay. The queue is flushed when process exits.
+
+Asynchronous submission overlaps only the submissions themselves. Plugins
+which need Deadline response of submitted job, e.g. publish job submitted
+after render job, still wait for that submission to be posted.
+
+"""
+import os
+import atexit
+import ctypes
+import platform
+import json
+import time
+import uuid
+import queue
+import tempfile
+import threading
+from concurrent.futures import Future
+
+import requests
+
+from ayon_core.lib import Logger, get_launcher_local_dir
+
+# Prefix of placeholder job ids of not yet submitted jobs
+PLACEHOLDER_PREFIX = "ayon-pending-"
+
+
+def get_spool_dir():
+    """Directory where submissions waiting to be posted are stored.
+
+    Returns:
+        str: Path to spool directory.
+
+    """
+    return get_launcher_local_dir("deadline", "submission_spool")
+
+
+def get_inflight_dir():
+    """Directory where submissions being posted in background are stored.
+
+    Payloads in this directory are never replayed.
+
+    Returns:
+        str: Path to in-flight directory.
+
+    """
+    return get_launcher_local_dir("deadline", "submission_inflight")
+
+
+def is_placeholder_id(job_id):
+    """Job id is placeholder of not yet submitted job.
+
+    Args:
+        job_id (Any): Job id.
+
+    Returns:
+        bool: Job id is placeholder.
+
+    """
+    return isinstance(job_id, str) and job_id.startswith(PLACEHOLDER_PREFIX)
+
+
+def has_placeholder_ids(job_info):
+    """JobInfo contains placeholder ids of not yet submitted jobs.
+
+    Args:
+        job_info (dict[str, Any]): Serialized JobInfo.
+
+    Returns:
+        bool: Any value contains placeholder id.
+
+    """
+    return any(
+        isinstance(value, str) and PLACEHOLDER_PREFIX in value
+        for value in job_info.values()
+    )
+
+
+def replace_placeholder_ids(job_info, job_ids_by_placeholder):
+    """Replace placeholder ids in JobInfo values with real job ids.
+
+    Args:
+        job_info (dict[str, Any]): Serialized JobInfo.
+        job_ids_by_placeholder (Union[dict[str, str], Callable]): Mapping
+            of placeholder ids to job ids, or function returning job id
+            for placeholder id. Unknown placeholders are kept.
+
+    Returns:
+        dict[str, Any]: JobInfo with replaced placeholder ids.
+
+    """
+    if callable(job_ids_by_placeholder):
+        get_job_id = job_ids_by_placeholder
+    else:
+        def get_job_id(placeholder_id):
+            return job_ids_by_placeholder.get(placeholder_id, placeholder_id)
+
+    resolved = {}
+    for key, value in job_info.items():
+        if isinstance(value, str) and PLACEHOLDER_PREFIX in value:
+            value = ",".join(
+                get_job_id(job_id.strip())
+                if is_placeholder_id(job_id.strip()) else job_id
+                for job_id in value.split(",")
+            )
+        resolved[key] = value
+    return resolved
+
+
+class SubmissionError(Exception):
+    """Raised when payload could not be posted to Deadline."""
+
+
+class WebserviceUnavailableError(SubmissionError):
+    """Raised when Deadline Webservice is not reachable or overloaded."""
+
+
+def post_payload(url, payload, auth=None, verify=None):
+    """POST payload to Deadline jobs end-point.
+
+    Args:
+        url (str): Deadline Webservice url.
+        payload (dict): Payload of the job.
+        auth (Optional[tuple]): (username, password)
+        verify (Optional[bool]): Verify SSL certificate if present.
+
+    Returns:
+        dict: Deadline response of submitted job.
+
+    Raises:
+        WebserviceUnavailableError: When webservice can't be reached or
+            responds with server error.
+        SubmissionError: When webservice refused the payload.
+
+    """
+    from .abstract_submit_deadline import requests_post
+
+    try:
+        response = requests_post(
+            "{}/api/jobs".format(url),
+            json=payload,
+            auth=auth,
+            verify=verify
+        )
+    except (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    ) as exc:
+        raise WebserviceUnavailableError(
+            "Cannot connect to DL web service {} - {}".format(url, exc))
+
+    if response.status_code >= 500:
+        raise WebserviceUnavailableError(
+            "{} {}".format(response.status_code, response.text))
+    if not response.ok:
+        raise SubmissionError(
+            "{} {}".format(response.status_code, response.text))
+    try:
+        return response.json()
+    except ValueError:
+        raise SubmissionError("Broken response from DL")
+
+
+def spool_payload(url, payload, verify=None, placeholder_id=None,
+                  spool_dir=None):
+    """Store payload to spool directory to be submitted later.
+
+    Args:
+        url (str): Deadline Webservice url.
+        payload (dict): Payload of the job.
+        verify (Optional[bool]): Verify SSL certificate if present.
+        placeholder_id (Optional[str]): Placeholder id of the job, new one
+            is created if not passed.
+        spool_dir (Optional[str]): Spool directory.
+
+    Returns:
+        str: Placeholder id of the spooled job.
+
+    """
+    if placeholder_id is None:
+        placeholder_id = _new_placeholder_id()
+    if spool_dir is None:
+        spool_dir = get_spool_dir()
+
+    _write_spool_file(
+        os.path.join(spool_dir, "{}.json".format(placeholder_id)),
+        _get_spool_data(url, payload, verify, placeholder_id)
+    )
+    return placeholder_id
+
+
+def _new_placeholder_id():
+    return "{}{}".format(PLACEHOLDER_PREFIX, uuid.uuid4().hex)
+
+
+def _get_spool_data(url, payload, verify, placeholder_id):
+    # Credentials are not stored on disk
+    return {
+        "placeholder_id": placeholder_id,
+        "created": time.time(),
+        "url": url,
+        "verify": verify,
+        "payload": payload,
+    }
+
+
+def _write_spool_file(path, data):
+    dirpath = os.path.dirname(path)
+    os.makedirs(dirpath, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dirpath, suffix=".tmp")
+    with os.fdopen(fd, "w") as stream:
+        json.dump(data, stream)
+    os.replace(tmp_path, path)
+
+
+def get_spooled_result(placeholder_id, payload):
+    """Fake Deadline response of job which was spooled.
+
+    Contains data needed by dependent submissions, job id is the
+    placeholder id.
+
+    Args:
+        placeholder_id (str): Placeholder id of the spooled job.
+        payload (dict): Payload of the spooled job.
+
+    Returns:
+        dict: Response-like data of the spooled job.
+
+    """
+    job_info = payload["JobInfo"]
+    return {
+        "_id": placeholder_id,
+        "Props": {
+            "Batch": job_info.get("BatchName"),
+            "User": job_info.get("UserName"),
+        },
+        "spooled": True,
+    }
+
+
+def post_or_spool(url, payload, auth=None, verify=None,
+                  spool_on_failure=False, placeholder_id=None,
+                  spool_dir=None):
+    """POST payload to Deadline, spool it if webservice is unavailable.
+
+    Payload depending on spooled job is spooled right away.
+
+    Args:
+        url (str): Deadline Webservice url.
+        payload (dict): Payload of the job.
+        auth (Optional[tuple]): (username, password)
+        verify (Optional[bool]): Verify SSL certificate if present.
+        spool_on_failure (bool): Spool payload instead of raising
+            'WebserviceUnavailableError'.
+        placeholder_id (Optional[str]): Placeholder id used when payload
+            is spooled.
+        spool_dir (Optional[str]): Spool directory.
+
+    Returns:
+        dict: Deadline response of submitted job, or response-like data
+            with placeholder id of spooled job.
+
+    """
+    if spool_on_failure and has_placeholder_ids(payload["JobInfo"]):
+        placeholder_id = spool_payload(
+            url, payload, verify, placeholder_id, spool_dir)
+        return get_spooled_result(placeholder_id, payload)
+
+    try:
+        return post_payload(url, payload, auth, verify)
+    except WebserviceUnavailableError:
+        if not spool_on_failure:
+            raise
+        placeholder_id = spool_payload(
+            url, payload, verify, placeholder_id, spool_dir)
+        Logger.get_logger(__name__).warning(
+            "Deadline Webservice is unavailable, submission was spooled"
+            " as '{}'.".format(placeholder_id)
+        )
+        return get_spooled_result(placeholder_id, payload)
+
+
+def _is_process_running(pid):
+    """Process with the id is running.
+
+    Args:
+        pid (int): Process id.
+
+    Returns:
+        bool: Process is running.
+
+    """
+    if platform.system().lower() == "windows":
+        kernel32 = ctypes.windll.kernel32
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        try:
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        finally:
+            kernel32.CloseHandle(handle)
+        # STILL_ACTIVE
+        return exit_code.value == 259
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover_inflight_submissions(spool_dir=None, inflight_dir=None, log=None):
+    """Move in-flight payloads of ended processes to spool directory.
+
+    Process which crashed or was killed before its payloads were posted
+    leaves them in in-flight directory. Payloads of running processes are
+    not touched. Recovered payload might have been posted right before the
+    process ended, then replay submits it again.
+
+    Args:
+        spool_dir (Optional[str]): Spool directory.
+        inflight_dir (Optional[str]): In-flight directory.
+        log (Optional[logging.Logger]): Logger.
+
+    Returns:
+        list[str]: Placeholder ids of recovered payloads.
+
+    """
+    if spool_dir is None:
+        spool_dir = get_spool_dir()
+    if inflight_dir is None:
+        inflight_dir = get_inflight_dir()
+    if log is None:
+        log = Logger.get_logger(__name__)
+
+    recovered = []
+    if not os.path.isdir(inflight_dir):
+        return recovered
+
+    for entry in os.scandir(inflight_dir):
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            with open(entry.path, "r") as stream:
+                data = json.load(stream)
+        except (OSError, ValueError):
+            log.warning(
+                "Failed to read in-flight submission '%s'.", entry.path)
+            continue
+
+        pid = data.pop("pid", None)
+        if pid is not None and _is_process_running(pid):
+            continue
+
+        _write_spool_file(os.path.join(spool_dir, entry.name), data)
+        os.remove(entry.path)
+        log.warning(
+            "Recovered in-flight submission '%s' of process which ended"
+            " before posting it.", data["placeholder_id"]
+        )
+        recovered.append(data["placeholder_id"])
+    return recovered
+
+
+def replay_spooled_submissions(
+    get_auth=None, spool_dir=None, log=None, inflight_dir=None
+):
+    """Submit spooled payloads to Deadline in order they were spooled.
+
+    In-flight payloads of processes which ended before posting them are
+    recovered to spool first, see `recover_inflight_submissions`.
+
+    Placeholder ids in dependencies of remaining spooled payloads are
+    replaced by real ids of submitted jobs. Payloads depending on jobs
+    which were not submitted are kept in spool.
+
+    Args:
+        get_auth (Optional[Callable[[str], Optional[tuple]]]): Returns
+            credentials for webservice url.
+        spool_dir (Optional[str]): Spool directory.
+        log (Optional[logging.Logger]): Logger.
+        inflight_dir (Optional[str]): In-flight directory.
+
+    Returns:
+        dict[str, str]: Submitted job ids by placeholder ids.
+
+    """
+    if spool_dir is None:
+        spool_dir = get_spool_dir()
+    if log is None:
+        log = Logger.get_logger(__name__)
+
+    recover_inflight_submissions(spool_dir, inflight_dir, log)
+
+    spooled = []
+    if os.path.isdir(spool_dir):
+        for entry in os.scandir(spool_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "r") as stream:
+                    data = json.load(stream)
+            except (OSError, ValueError):
+                log.warning(
+                    "Failed to read spooled submission '%s'.", entry.path)
+                continue
+            spooled.append((data, entry.path))
+    spooled.sort(key=lambda item: item[0].get("created", 0))
+
+    job_ids_by_placeholder = {}
+    for data, path in spooled:
+        payload = data["payload"]
+        placeholder_id = data["placeholder_id"]
+        payload["JobInfo"] = replace_placeholder_ids(
+            payload["JobInfo"], job_ids_by_placeholder)
+        if has_placeholder_ids(payload["JobInfo"]):
+            log.warning(
+                "Skipping '%s', it depends on job which was not submitted.",
+                placeholder_id
+            )
+            continue
+
+        url = data["url"]
+        auth = get_auth(url) if get_auth else None
+        try:
+            result = post_payload(url, payload, auth, data.get("verify"))
+        except WebserviceUnavailableError as exc:
+            log.error("Deadline Webservice is still unavailable: %s", exc)
+            break
+        except SubmissionError as exc:
+            log.error("Failed to submit '%s': %s", placeholder_id, exc)
+            continue
+
+        job_id = result["_id"]
+        job_ids_by_placeholder[placeholder_id] = job_id
+        log.info("Submitted '%s' as job '%s'.", placeholder_id, job_id)
+        os.remove(path)
+
+    # Rewrite dependencies of payloads left in spool
+    if job_ids_by_placeholder:
+        for data, path in spooled:
+            if not os.path.exists(path):
+                continue
+            payload = data["payload"]
+            payload["JobInfo"] = replace_placeholder_ids(
+                payload["JobInfo"], job_ids_by_placeholder)
+            _write_spool_file(path, data)
+
+    return job_ids_by_placeholder
+
+
+class DeadlineSubmissionQueue:
+    """Queue posting payloads to Deadline in a background thread.
+
+    Payloads are kept in in-flight directory until they are posted. Only
+    payloads which should be spooled are moved to spool directory, others
+    are removed whether they were posted or failed. Pending payloads are
+    posted before the process exits.
+
+    Args:
+        spool_dir (Optional[str]): Directory where payloads are spooled.
+        inflight_dir (Optional[str]): Directory where payloads are stored
+            while being posted.
+
+    """
+    def __init__(self, spool_dir=None, inflight_dir=None):
+        if spool_dir is None:
+            spool_dir = get_spool_dir()
+        if inflight_dir is None:
+            inflight_dir = get_inflight_dir()
+        self._spool_dir = spool_dir
+        self._inflight_dir = inflight_dir
+        self._queue = queue.Queue()
+        self._futures_by_placeholder = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._exit_handler_registered = False
+        self._log = None
+
+    @property
+    def log(self):
+        if self._log is None:
+            self._log = Logger.get_logger(self.__class__.__name__)
+        return self._log
+
+    def enqueue(self, url, payload, auth=None, verify=None,
+                spool_on_failure=False):
+        """Store payload and schedule it for posting to Deadline.
+
+        Args:
+            url (str): Deadline Webservice url.
+            payload (dict): Payload of the job.
+            auth (Optional[tuple]): (username, password)
+            verify (Optional[bool]): Verify SSL certificate if present.
+            spool_on_failure (bool): Keep payload in spool instead of
+                failing when Deadline Webservice is unavailable.
+
+        Returns:
+            Future: Future resolved with Deadline response of submitted job.
+                The future has 'placeholder_id' attribute.
+
+        """
+        placeholder_id = _new_placeholder_id()
+        inflight_path = os.path.join(
+            self._inflight_dir, "{}.json".format(placeholder_id))
+        data = _get_spool_data(url, payload, verify, placeholder_id)
+        # Payloads of ended process are recovered by replay
+        data["pid"] = os.getpid()
+        _write_spool_file(inflight_path, data)
+
+        future = Future()
+        future.placeholder_id = placeholder_id
+        with self._lock:
+            self._futures_by_placeholder[placeholder_id] = future
+        self._queue.put(
+            (
+                future, inflight_path, url, payload, auth, verify,
+                spool_on_failure
+            )
+        )
+        self._ensure_worker()
+        return future
+
+    def resolve_job_id(self, job_id, timeout=None):
+        """Return real job id for placeholder id.
+
+        Waits for the submission if it was not posted yet. Placeholder id
+        is returned for spooled jobs.
+
+        Args:
+            job_id (str): Job id or placeholder id.
+            timeout (Optional[float]): Maximum seconds to wait.
+
+        Returns:
+            str: Deadline job id.
+
+        """
+        if not is_placeholder_id(job_id):
+            return job_id
+        with self._lock:
+            future = self._futures_by_placeholder.get(job_id)
+        if future is None:
+            return job_id
+        return future.result(timeout)["_id"]
+
+    def flush(self, timeout=None):
+        """Wait until all enqueued payloads are posted or spooled.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait.
+
+        Returns:
+            bool: All enqueued payloads were processed.
+
+        """
+        end_time = None
+        if timeout is not None:
+            end_time = time.time() + timeout
+        all_tasks_done = self._queue.all_tasks_done
+        with all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None
+                if end_time is not None:
+                    remaining = end_time - time.time()
+                    if remaining <= 0:
+                        return False
+                all_tasks_done.wait(remaining)
+        return True
+
+    def _flush_on_exit(self):
+        pending = self._queue.unfinished_tasks
+        if not pending:
+            return
+        self.log.info(
+            "Waiting for %s pending Deadline submissions.", pending)
+        self.flush()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if not self._exit_handler_registered:
+                # Worker is daemon thread, it would be killed on exit with
+                #   payloads left in in-flight directory
+                atexit.register(self._flush_on_exit)
+                self._exit_handler_registered = True
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._worker, name="DeadlineSubmission", daemon=True
+            )
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            (
+                future, inflight_path, url, payload, auth, verify,
+                spool_on_failure
+            ) = item
+            try:
+                payload["JobInfo"] = replace_placeholder_ids(
+                    payload["JobInfo"], self.resolve_job_id)
+                # Spooled payload is written to spool directory with
+                #   resolved dependencies
+                result = post_or_spool(
+                    url,
+                    payload,
+                    auth,
+                    verify,
+                    spool_on_failure=spool_on_failure,
+                    placeholder_id=future.placeholder_id,
+                    spool_dir=self._spool_dir
+                )
+            except Exception as exc:
+                self.log.warning(
+                    "Deadline submission failed.", exc_info=True)
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+            finally:
+                try:
+                    os.remove(inflight_path)
+                except OSError:
+                    pass
+                self._queue.task_done()
+
+
+_submission_queue = None
+_submission_queue_lock = threading.Lock()
+
+
+def get_submission_queue():
+    """Return submission queue shared in current process.
+
+    Returns:
+        DeadlineSubmissionQueue: Submission queue.
+
+    """
+    global _submission_queue
+    with _submission_queue_lock:
+        if _submission_queue is None:
+            _submission_queue = DeadlineSubmissionQueue()
+    return _submission_queue
+
+
+def resolve_job_id(job_id, timeout=None):
+    """Return real Deadline job id, wait for submission if needed.
+
+    Args:
+        job_id (str): Job id or placeholder id of pending submission.
+        timeout (Optional[float]): Maximum seconds to wait.
+
+    Returns:
+        str: Deadline job id.
+
+    """
+    if not is_placeholder_id(job_id):
+        return job_id
+    return get_submission_queue().resolve_job_id(job_id, timeout)
+
+
+def resolve_submission_job(submission_job, timeout=None):
+    """Return Deadline response of submitted job.
+
+    Value of 'deadlineSubmissionJob' on instance is a future when job was
+    submitted asynchronously. This waits for the job to be submitted.
+
+    Args:
+        submission_job (Union[dict, Future, None]): Value of
+            'deadlineSubmissionJob' instance data.
+        timeout (Optional[float]): Maximum seconds to wait.
+
+    Returns:
+        Union[dict, None]: Deadline response of submitted job.
+
+    """
+    if isinstance(submission_job, Future):
+        return submission_job.result(timeout)
+    return submission_job
@@ -71,6 +71,49 @@ class DeadlineSettings(BaseSettingsModel):
         enum_resolver=defined_deadline_ws_name_enum_resolver
     )
 
+    async_submission: bool = SettingsField(
+        False,
+        title="Asynchronous submission",
+        description=(
+            "Spool jobs locally and submit them to Deadline in background"
+            " so publishing doesn't wait for each Webservice request."
+            " Publish job is submitted once the job it depends on is"
+            " submitted."
+        ),
+        scope=["project"],
+    )
+    spool_failed_submissions: bool = SettingsField(
+        False,
+        title="Spool submissions when Webservice is unavailable",
+        description=(
+            "Store jobs locally when Deadline Webservice can't be reached"
+            " instead of failing the publish. Spooled jobs are submitted"
+            " with 'ayon addon deadline replay-submissions'."
+        ),
+        scope=["project"],
+    )
+    webservice_pool_size: int = SettingsField(
+        10,
+        title="Webservice connection pool size",
+        ge=1,
+        description=(
+            "Maximum connections to Deadline Webservice kept open for"
+            " reuse, e.g. by asynchronous submission."
+        ),
+        scope=["project"],
+    )
+    webservice_max_retries: int = SettingsField(
+        3,
+        title="Webservice request retries",
+        ge=0,
+        description=(
+            "Retries of requests to Deadline Webservice which failed on"
+            " connection errors. Failed responses are retried only for"
+            " requests which don't submit jobs."
+        ),
+        scope=["project"],
+    )
+
     publish: PublishPluginsModel = SettingsField(
         default_factory=PublishPluginsModel,
         title="Publish Plugins",
@@ -96,5 +139,9 @@ DEFAULT_VALUES = {
         }
     ],
     "deadline_server": "default",
+    "async_submission": False,
+    "spool_failed_submissions": False,
+    "webservice_pool_size": 10,
+    "webservice_max_retries": 3,
     "publish": DEFAULT_DEADLINE_PLUGINS_SETTINGS
 }
@@ -144,6 +144,40 @@ class ValidateExpectedFilesModel(BaseSettingsModel):
     allow_user_override: bool = SettingsField(
         True, title="Allow user change frame range"
     )
+    job_info_timeout: int = SettingsField(
+        60,
+        title="Job info timeout",
+        ge=1,
+        description=(
+            "Seconds for querying frame ranges of all render jobs from"
+            " Deadline."
+        ),
+    )
+    check_file_sizes: bool = SettingsField(
+        False,
+        title="Check file sizes",
+        description=(
+            "Consider empty files as missing and warn about files much"
+            " smaller than other files of the representation."
+        ),
+    )
+    submit_missing_frames: bool = SettingsField(
+        False,
+        title="Submit missing frames",
+        description=(
+            "Instead of failing, submit render of missing frames and"
+            " a publish job waiting for it."
+        ),
+    )
+    max_missing_frames_submissions: int = SettingsField(
+        1,
+        title="Max submissions of missing frames",
+        ge=1,
+        description=(
+            "How many times missing frames of one render can be submitted"
+            " before publish fails."
+        ),
+    )
     families: list[str] = SettingsField(
         default_factory=list, title="Trigger on families"
     )
@@ -173,6 +207,12 @@ class ScenePatchesSubmodel(BaseSettingsModel):
     line: str = SettingsField(title="Patch line")
 
 
+class SubmitMissingFramesModel(BaseSettingsModel):
+    """Submits render of missing frames when enabled in Validate Expected
+    Files."""
+    enabled: bool = SettingsField(True, title="Enabled")
+
+
 class MayaSubmitDeadlineModel(BaseSettingsModel):
     """Maya deadline submitter settings."""
 
@@ -327,6 +367,10 @@ class PublishPluginsModel(BaseSettingsModel):
         default_factory=ValidateExpectedFilesModel,
         title="Validate Expected Files"
     )
+    SubmitMissingFrames: SubmitMissingFramesModel = SettingsField(
+        default_factory=SubmitMissingFramesModel,
+        title="Submit Missing Frames"
+    )
     FusionSubmitDeadline: FusionSubmitDeadlineModel = SettingsField(
         default_factory=FusionSubmitDeadlineModel,
         title="Fusion submit to Deadline")
@@ -391,6 +435,10 @@ DEFAULT_DEADLINE_PLUGINS_SETTINGS = {
         "enabled": True,
         "active": True,
         "allow_user_override": True,
+        "job_info_timeout": 60,
+        "check_file_sizes": False,
+        "submit_missing_frames": False,
+        "max_missing_frames_submissions": 1,
         "families": [
             "render"
         ],
@@ -398,6 +446,9 @@ DEFAULT_DEADLINE_PLUGINS_SETTINGS = {
             "deadline"
         ]
     },
+    "SubmitMissingFrames": {
+        "enabled": True
+    },
     "FusionSubmitDeadline": {
         "plugin": "Fusion"
     },